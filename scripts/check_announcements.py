@@ -1,43 +1,148 @@
-"""Check announcements - try multiple API endpoints and params."""
-import requests, json
-from bs4 import BeautifulSoup
+"""Check announcements - try multiple API endpoints and params.
+
+Courses are probed on a thread pool over one keep-alive requests.Session whose
+connection pool is capped at MAX_WORKERS, so the fan-out reuses at most that
+many HTTP/1.1 sockets to Sakai rather than opening one per request.
+"""
+import json
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from lxml import etree, html
 from sakai_bot.config import get_settings
+from sakai_login import get_sites, load_session, new_session
+
+# Courses are probed concurrently; each probe issues several blocking GETs
+MAX_WORKERS = 8
+
+# Tool pages are streamed into the HTML parser in chunks of this size
+STREAM_CHUNK = 8192
+
+
+def has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Compiled once, reused for every course (.portletBody, #content, .Mrphs-toolBody)
+CONTAINERS = etree.XPath(f"//*[{has_class('portletBody')} or @id='content' or {has_class('Mrphs-toolBody')}]")
+LINKS = etree.XPath(".//a")
+
+# ETag/Last-Modified validators (plus the last body) per URL, kept between runs
+HTTP_CACHE_PATH = Path.home() / ".sakai_bot" / "http_cache.json"
+try:
+    http_cache = json.loads(HTTP_CACHE_PATH.read_text())
+except (OSError, json.JSONDecodeError):
+    http_cache = {}  # missing or corrupt - start over
+# Guards http_cache, which the probe threads update concurrently
+http_cache_lock = threading.Lock()
+
+# (status, data) per URL already fetched this run, and one lock per URL so
+# threads probing the same URL wait for a single request
+json_results = {}
+url_locks = defaultdict(threading.Lock)
+url_locks_lock = threading.Lock()
 
 s = get_settings()
-sess = requests.Session()
-sess.headers.update({"User-Agent": "Mozilla/5.0"})
-sess.post(f"{s.sakai_base_url}/portal/xlogin", data={"eid": s.sakai_username, "pw": s.sakai_password})
+# Cap in-flight connections to Sakai at MAX_WORKERS (pool_block makes extra
+# threads wait for a free socket)
+sess = load_session(new_session(pool_size=MAX_WORKERS, pool_block=True))
 
 # Get filtered courses
-r = sess.get(f"{s.sakai_base_url}/direct/site.json?_limit=50&_start=0")
-all_sites = json.loads(r.text).get("site_collection", [])
-courses = [site for site in all_sites if s.current_semester in site.get("title", "")]
+all_sites = get_sites(sess, "/direct/site.json?_limit=50&_start=0")
+# Bind the term once; unset CURRENT_SEMESTER ("") keeps every site
+sem = s.current_semester or ""
+courses = [site for site in all_sites if sem in (site.get("title") or "")]
 
-for course in courses:
+
+def get_json(url):
+    """
+    Conditional GET for a JSON endpoint, at most once per URL per run.
+
+    Concurrent callers for the same URL block on a per-URL lock while the
+    first one fetches, then all share its result. Returns (status_code,
+    data); status is None if the request itself failed.
+    """
+    with url_locks_lock:
+        url_lock = url_locks[url]
+    with url_lock:
+        if url not in json_results:
+            json_results[url] = fetch_json(url)
+        return json_results[url]
+
+
+def fetch_json(url):
+    """
+    Send one conditional GET for a JSON endpoint.
+
+    Sends the cached validators so unchanged feeds come back as an empty
+    304, then serves the cached body.
+    """
+    with http_cache_lock:
+        cached = http_cache.get(url)
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        r = sess.get(url, headers=headers)
+    except requests.RequestException:
+        return None, None
+    if r.status_code == 304 and cached:
+        return 200, cached["data"]
+    if r.status_code != 200:
+        return r.status_code, None
+
+    try:
+        data = json.loads(r.content)
+    except ValueError:
+        return None, None
+    etag = r.headers.get("ETag")
+    last_modified = r.headers.get("Last-Modified")
+    if etag or last_modified:
+        with http_cache_lock:
+            http_cache[url] = {"etag": etag, "last_modified": last_modified, "data": data}
+    return 200, data
+
+
+def text_of(elem):
+    """Concatenated, stripped text of an lxml element (like bs4 get_text(strip=True))."""
+    return "".join(part.strip() for part in elem.itertext())
+
+
+def probe(course):
+    """Run every announcement check for one course and return the report lines."""
     sid = course["id"]
     title = course["title"]
-    print(f"\n{'='*60}")
-    print(f"  {title} (id: {sid})")
-    print(f"{'='*60}")
-    
+    out = [
+        f"\n{'='*60}",
+        f"  {title} (id: {sid})",
+        f"{'='*60}",
+    ]
+
     # Method 1: REST API
-    r = sess.get(f"{s.sakai_base_url}/direct/announcement/site/{sid}.json")
-    if r.status_code == 200:
-        anns = json.loads(r.text).get("announcement_collection", [])
-        print(f"  REST API: {len(anns)} announcements")
+    status, data = get_json(f"{s.sakai_base_url}/direct/announcement/site/{sid}.json")
+    if status == 200:
+        anns = data.get("announcement_collection", [])
+        out.append(f"  REST API: {len(anns)} announcements")
     else:
-        print(f"  REST API: HTTP {r.status_code}")
+        out.append(f"  REST API: HTTP {status}")
 
     # Method 2: REST API with no limit
-    r = sess.get(f"{s.sakai_base_url}/direct/announcement/site/{sid}.json?_limit=100&n=100")
-    if r.status_code == 200:
-        anns = json.loads(r.text).get("announcement_collection", [])
-        print(f"  REST API (limit=100): {len(anns)} announcements")
+    status, data = get_json(f"{s.sakai_base_url}/direct/announcement/site/{sid}.json?_limit=100&n=100")
+    if status == 200:
+        anns = data.get("announcement_collection", [])
+        out.append(f"  REST API (limit=100): {len(anns)} announcements")
 
     # Method 3: Check what tools exist on this site
     r = sess.get(f"{s.sakai_base_url}/direct/site/{sid}.json")
     if r.status_code == 200:
-        site_data = json.loads(r.text)
+        site_data = json.loads(r.content)
         pages = site_data.get("sitePages", [])
         for page in pages:
             page_title = page.get("title", "")
@@ -46,74 +151,109 @@ for course in courses:
                 tool_id = tool.get("toolId", "")
                 if "annc" in tool_id.lower() or "announcement" in tool_id.lower() or "announcement" in page_title.lower():
                     placement_id = tool.get("id", "")
-                    print(f"  Found announcement tool: {tool_id} (placement: {placement_id})")
-                    
+                    out.append(f"  Found announcement tool: {tool_id} (placement: {placement_id})")
+
                     # Try accessing with the placement ID
-                    r2 = sess.get(f"{s.sakai_base_url}/direct/announcement/site/{sid}.json?_limit=100")
-                    if r2.status_code == 200:
-                        anns2 = json.loads(r2.text).get("announcement_collection", [])
-                        print(f"    -> {len(anns2)} announcements via placement")
+                    status, data = get_json(f"{s.sakai_base_url}/direct/announcement/site/{sid}.json?_limit=100")
+                    if status == 200:
+                        anns2 = data.get("announcement_collection", [])
+                        out.append(f"    -> {len(anns2)} announcements via placement")
 
     # Method 4: Scrape the actual Announcements tool page
-    r = sess.get(f"{s.sakai_base_url}/portal/site/{sid}/tool-reset/sakai.announcements")
-    if r.status_code == 200:
-        soup = BeautifulSoup(r.text, "lxml")
-        # Look for announcement rows in the table
-        rows = soup.select('tr')
-        ann_rows = []
-        for row in rows:
-            cells = row.select('td')
-            if cells:
-                ann_rows.append([c.get_text(strip=True)[:80] for c in cells])
-        if ann_rows:
-            print(f"  HTML Announcements page: {len(ann_rows)} rows")
-            for row in ann_rows[:5]:
-                print(f"    -> {row}")
+    with sess.get(f"{s.sakai_base_url}/portal/site/{sid}/tool-reset/sakai.announcements", stream=True) as r:
+        if r.status_code == 200:
+            # Stream the page through lxml, pulling announcement rows out as each
+            # </tr> arrives and clearing it so the table is never held whole
+            parser = etree.HTMLPullParser(events=("end",), tag="tr")
+            ann_rows = []
+            for chunk in r.iter_content(STREAM_CHUNK):
+                parser.feed(chunk)
+                for _, row in parser.read_events():
+                    cells = list(row.iter("td"))
+                    if cells:
+                        ann_rows.append([text_of(c)[:80] for c in cells])
+                    row.clear(keep_tail=True)
+            root = parser.close()
+            if ann_rows:
+                out.append(f"  HTML Announcements page: {len(ann_rows)} rows")
+                for row in ann_rows[:5]:
+                    out.append(f"    -> {row}")
+            else:
+                # Maybe it uses a different structure
+                body_text = text_of(root)[:500] if root is not None else ""
+                out.append(f"  HTML page body preview: {body_text[:200]}")
         else:
-            # Maybe it uses a different structure
-            body_text = soup.get_text(strip=True)[:500]
-            print(f"  HTML page body preview: {body_text[:200]}")
-    else:
-        print(f"  HTML Announcements tool: HTTP {r.status_code}")
+            out.append(f"  HTML Announcements tool: HTTP {r.status_code}")
 
     # Method 5: Try the announcements tool with different tool IDs
     for tool_name in ["sakai.announcements", "sakai.synoptic.announcement"]:
         r = sess.get(f"{s.sakai_base_url}/portal/site/{sid}/tool-reset/{tool_name}")
-        if r.status_code == 200 and len(r.text) > 500:
-            soup = BeautifulSoup(r.text, "lxml")
+        if r.status_code == 200 and len(r.content) > 500:
+            tree = html.fromstring(r.content)
             # Look for any content containers
-            containers = soup.select('.portletBody, #content, .Mrphs-toolBody')
-            for c in containers:
-                links = c.select('a')
+            for c in CONTAINERS(tree):
+                links = LINKS(c)
                 if links:
-                    print(f"  {tool_name}: found {len(links)} links")
+                    out.append(f"  {tool_name}: found {len(links)} links")
                     for link in links[:3]:
-                        print(f"    -> {link.get_text(strip=True)[:80]}")
+                        out.append(f"    -> {text_of(link)[:80]}")
 
-# Also check the "Message of the Day" channel and merged channels
-print(f"\n{'='*60}")
-print("  Checking merged/alternate announcement channels")
-print(f"{'='*60}")
-for course in courses:
+    return out
+
+
+def probe_channels(course):
+    """Check the "main" and "motd" announcement channels for one course."""
     sid = course["id"]
     title = course["title"]
-    # Try message_channel endpoint
+    out = []
     for channel in ["main", "motd"]:
-        r = sess.get(f"{s.sakai_base_url}/direct/announcement/site/{sid}/channel/{channel}.json")
-        if r.status_code == 200:
-            data = json.loads(r.text)
+        status, data = get_json(f"{s.sakai_base_url}/direct/announcement/site/{sid}/channel/{channel}.json")
+        if status == 200:
             if isinstance(data, dict):
                 anns = data.get("announcement_collection", [])
-                print(f"  {title} ({channel}): {len(anns)} announcements")
+                out.append(f"  {title} ({channel}): {len(anns)} announcements")
+    return out
+
+
+# The user feed covers every site in one request; group it by site so only
+# courses missing from it need the per-site probes
+feed_status, feed = get_json(f"{s.sakai_base_url}/direct/announcement/user.json?n=50&_limit=50")
+user_anns = feed.get("announcement_collection", []) if feed_status == 200 else []
+by_site = defaultdict(list)
+for a in user_anns:
+    by_site[a.get("siteId")].append(a)
+
+missing = [course for course in courses if not by_site.get(course["id"])]
+for course in courses:
+    if by_site.get(course["id"]):
+        print(f"\n  {course['title']}: {len(by_site[course['id']])} announcements (user feed)")
+
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+    # map() keeps the report in course order even though probes overlap
+    for lines in pool.map(probe, missing):
+        print("\n".join(lines))
+
+    # Also check the "Message of the Day" channel and merged channels
+    print(f"\n{'='*60}")
+    print("  Checking merged/alternate announcement channels")
+    print(f"{'='*60}")
+    for lines in pool.map(probe_channels, courses):
+        if lines:
+            print("\n".join(lines))
 
 # Full user feed with details
 print(f"\n{'='*60}")
-print("  User-level feed (full)")  
+print("  User-level feed (full)")
 print(f"{'='*60}")
-r = sess.get(f"{s.sakai_base_url}/direct/announcement/user.json?n=50&_limit=50")
-if r.status_code == 200:
-    user_anns = json.loads(r.text).get("announcement_collection", [])
+if feed_status == 200:
     print(f"  Total: {len(user_anns)}")
     for a in user_anns:
         print(f"  - [{a.get('siteTitle','?')}] {a.get('title','?')[:60]}")
         print(f"    siteId: {a.get('siteId','?')}, channel: {a.get('announcementId','?')[:80]}")
+
+HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+# Cached responses include course content - keep the file owner-readable only
+fd = os.open(HTTP_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+os.chmod(HTTP_CACHE_PATH, 0o600)  # the mode above only applies to a new file
+with os.fdopen(fd, "w") as f:
+    json.dump(http_cache, f)
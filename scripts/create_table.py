@@ -1,22 +1,15 @@
-"""Create the sent_notifications table in Supabase."""
+"""Create the sent_notifications table in Supabase.
+
+With SUPABASE_DB_URL set (and `pip install "psycopg[binary]"`), the DDL runs
+directly over the Postgres protocol in one round-trip. Otherwise it falls
+back to the PostgREST exec_sql RPC.
+"""
 
 import requests
 from sakai_bot.config import get_settings
 
 settings = get_settings()
 
-# Use the Supabase Management API to run SQL
-# We'll use the REST API with RPC or direct SQL
-# Supabase service role key gives us admin access
-
-# First, let's try creating via the PostgREST rpc endpoint
-url = f"{settings.supabase_url}/rest/v1/rpc/exec_sql"
-headers = {
-    "apikey": settings.supabase_service_role_key,
-    "Authorization": f"Bearer {settings.supabase_service_role_key}",
-    "Content-Type": "application/json",
-}
-
 # The SQL to create the table
 sql = """
 CREATE TABLE IF NOT EXISTS sent_notifications (
@@ -33,12 +26,42 @@ CREATE INDEX IF NOT EXISTS idx_sent_notifications_dedup_key
     ON sent_notifications (dedup_key);
 """
 
-print("Trying to create table via RPC...")
-resp = requests.post(url, headers=headers, json={"query": sql})
-print(f"Status: {resp.status_code}")
-print(f"Response: {resp.text[:500]}")
 
-if resp.status_code != 200:
+def create_via_postgres():
+    """Run the DDL over a direct connection. Returns False if not configured."""
+    if not settings.supabase_db_url:
+        return False
+    try:
+        import psycopg
+    except ImportError:
+        print("SUPABASE_DB_URL is set but psycopg is not installed; using RPC instead.")
+        return False
+
+    print("Creating table via direct Postgres connection...")
+    # Both statements go in one simple-query message, so one round-trip
+    with psycopg.connect(settings.supabase_db_url, sslmode="require") as conn:
+        conn.execute(sql)
+    print("Done.")
+    return True
+
+
+def create_via_rpc():
+    """Run the DDL through the PostgREST exec_sql RPC, if the project defines it."""
+    url = f"{settings.supabase_url}/rest/v1/rpc/exec_sql"
+    headers = {
+        "apikey": settings.supabase_service_role_key,
+        "Authorization": f"Bearer {settings.supabase_service_role_key}",
+        "Content-Type": "application/json",
+    }
+
+    print("Trying to create table via RPC...")
+    resp = requests.post(url, headers=headers, json={"query": sql})
+    print(f"Status: {resp.status_code}")
+    print(f"Response: {resp.text[:500]}")
+    return resp.status_code == 200
+
+
+if not create_via_postgres() and not create_via_rpc():
     print("\nRPC method didn't work. You need to create the table manually.")
     print("Go to https://supabase.com/dashboard, select your project,")
     print("go to SQL Editor, and run this SQL:\n")
@@ -1,33 +1,27 @@
 """Debug - check announcements via Sakai REST API."""
 
-import requests
 import json
 from sakai_bot.config import get_settings
+from sakai_login import get_sites, load_session, new_session
 
 settings = get_settings()
 base_url = settings.sakai_base_url
 
-session = requests.Session()
-session.headers.update({
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-})
+session = new_session(
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
 
-# Login
+# Login (reuses the cached session cookie when it is still valid)
 print("Logging in...")
-resp = session.post(
-    f"{base_url}/portal/xlogin",
-    data={"eid": settings.sakai_username, "pw": settings.sakai_password},
-)
+load_session(session)
 
 # Verify
 resp = session.get(f"{base_url}/direct/session/current.json")
-user = json.loads(resp.text)
+user = json.loads(resp.content)
 print(f"Logged in as: {user.get('userEid')}\n")
 
 # Get sites
-resp = session.get(f"{base_url}/direct/site.json")
-sites = json.loads(resp.text)
-courses = sites.get("site_collection", [])
+courses = get_sites(session)
 print(f"Total sites: {len(courses)}\n")
 
 # Check announcements via REST API
@@ -40,7 +34,7 @@ print("\n--- /direct/announcement/user.json ---")
 resp = session.get(f"{base_url}/direct/announcement/user.json")
 print(f"Status: {resp.status_code}")
 if resp.status_code == 200:
-    data = json.loads(resp.text)
+    data = json.loads(resp.content)
     colls = data.get("announcement_collection", [])
     print(f"Found {len(colls)} announcements")
     for ann in colls[:5]:
@@ -56,7 +50,7 @@ for site in courses[:5]:
     title = site.get("title", "?")
     resp = session.get(f"{base_url}/direct/announcement/site/{site_id}.json")
     if resp.status_code == 200:
-        data = json.loads(resp.text)
+        data = json.loads(resp.content)
         anns = data.get("announcement_collection", [])
         if anns:
             print(f"\n  [{title}] - {len(anns)} announcements:")
@@ -74,7 +68,7 @@ print("\n--- /direct/assignment/my.json ---")
 resp = session.get(f"{base_url}/direct/assignment/my.json")
 print(f"Status: {resp.status_code}")
 if resp.status_code == 200:
-    data = json.loads(resp.text)
+    data = json.loads(resp.content)
     colls = data.get("assignment_collection", [])
     print(f"Found {len(colls)} assignments")
     for a in colls[:5]:
@@ -89,7 +83,7 @@ for site in courses[:5]:
     title = site.get("title", "?")
     resp = session.get(f"{base_url}/direct/assignment/site/{site_id}.json")
     if resp.status_code == 200:
-        data = json.loads(resp.text)
+        data = json.loads(resp.content)
         assigns = data.get("assignment_collection", [])
         if assigns:
             print(f"\n  [{title}] - {len(assigns)} assignments:")
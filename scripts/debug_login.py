@@ -1,9 +1,9 @@
 """Test login with corrected username."""
 
-import requests
 import json
-from bs4 import BeautifulSoup
+from lxml import html
 from sakai_bot.config import get_settings
+from sakai_login import new_session, save_cookies
 
 settings = get_settings()
 base_url = settings.sakai_base_url
@@ -12,10 +12,9 @@ print(f"Username: '{settings.sakai_username}'")
 print(f"Password: '{settings.sakai_password}'")
 print()
 
-session = requests.Session()
-session.headers.update({
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-})
+session = new_session(
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
 
 # POST login
 print("Logging in...")
@@ -32,23 +31,25 @@ resp = session.post(
     },
 )
 
-soup = BeautifulSoup(resp.text, 'lxml')
-title = soup.find('title')
-print(f"Title: {title.text if title else 'None'}")
+tree = html.fromstring(resp.content)
+title = tree.findtext('.//title')
+print(f"Title: {title if title is not None else 'None'}")
 
-error = soup.find(class_='alertMessage')
-if error:
-    print(f"Error: {error.get_text(strip=True)}")
+error = tree.xpath("string(//*[contains(concat(' ', normalize-space(@class), ' '), ' alertMessage ')])")
+if error.strip():
+    print(f"Error: {error.strip()}")
 
 # Check session
 resp2 = session.get(f"{base_url}/direct/session/current.json")
-data = json.loads(resp2.text)
+data = json.loads(resp2.content)
 print(f"User: {data.get('userEid')}")
 
 if data.get('userId'):
     print("\n=== LOGIN SUCCESS! ===")
+    # Always logs in fresh; refresh the cookie the other scripts reuse
+    save_cookies(session)
     resp3 = session.get(f"{base_url}/direct/site.json")
-    sites = json.loads(resp3.text)
+    sites = json.loads(resp3.content)
     print(f"Found {len(sites.get('site_collection', []))} sites")
     for site in sites.get('site_collection', [])[:10]:
         print(f"  - {site.get('title')}")
@@ -5,8 +5,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
-import time
 import json
 
 from sakai_bot.config import get_settings
@@ -20,6 +20,12 @@ options.add_experimental_option("excludeSwitches", ["enable-automation"])
 options.add_experimental_option("useAutomationExtension", False)
 # Enable network logging
 options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+# Return control at DOMContentLoaded and skip images/rendering - the script
+# only inspects the DOM and network log, and waits explicitly for elements
+options.set_capability("pageLoadStrategy", "eager")
+options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+options.add_argument("--headless=new")
+options.add_argument("--disable-gpu")
 
 print("Opening browser...")
 driver = webdriver.Chrome(
@@ -31,7 +37,8 @@ driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () =>
 try:
     print("Navigating to portal...")
     driver.get(f"{base_url}/portal")
-    time.sleep(3)
+    wait = WebDriverWait(driver, 10)
+    wait.until(EC.presence_of_element_located((By.ID, "eid")))
     
     # Check for iframes
     iframes = driver.find_elements(By.TAG_NAME, "iframe")
@@ -42,23 +49,27 @@ try:
     # Get FULL page source to analyze
     page_source = driver.page_source
     
+    # One lxml parse serves the script, form and modal checks below
+    from lxml import html
+    tree = html.fromstring(page_source)
+    
     # Look for JavaScript that handles form submission
-    from bs4 import BeautifulSoup
-    soup = BeautifulSoup(page_source, 'lxml')
+    scripts = tree.xpath('//script')
     
     # Check all scripts
-    print(f"\nScript tags: {len(soup.find_all('script'))}")
-    for script in soup.find_all('script'):
+    print(f"\nScript tags: {len(scripts)}")
+    for script in scripts:
         src = script.get('src', '')
-        content = script.string or ''
+        content = script.text or ''
         if 'login' in content.lower() or 'submit' in content.lower() or 'eid' in content.lower() or 'password' in content.lower():
             print(f"\n  Script with login-related content:")
             print(f"    src: {src}")
             print(f"    content: {content[:500]}")
     
     # Check the form more carefully
-    form = soup.find('form')
-    if form:
+    forms = tree.xpath('//form')
+    form = forms[0] if forms else None
+    if form is not None:
         print(f"\nForm details:")
         print(f"  action: {form.get('action')}")
         print(f"  method: {form.get('method')}")
@@ -67,14 +78,14 @@ try:
         print(f"  onsubmit: {form.get('onsubmit')}")
         
         # Get ALL attributes
-        print(f"  All attrs: {dict(form.attrs)}")
+        print(f"  All attrs: {dict(form.attrib)}")
         
         # Get all input fields, including type, name, value
-        for inp in form.find_all(['input', 'button', 'select', 'textarea']):
-            print(f"  <{inp.name}: {dict(inp.attrs)}>")
+        for inp in form.xpath('.//input | .//button | .//select | .//textarea'):
+            print(f"  <{inp.tag}: {dict(inp.attrib)}>")
     
     # Check if there's a login modal or popup
-    modals = soup.find_all(class_=lambda x: x and 'modal' in str(x).lower())
+    modals = tree.xpath("//*[contains(translate(@class, 'MODAL', 'modal'), 'modal')]")
     print(f"\nModal elements: {len(modals)}")
     for modal in modals:
         modal_id = modal.get('id', 'none')
@@ -120,15 +131,18 @@ try:
     
     eid_field.clear()
     eid_field.send_keys(settings.sakai_username)
-    time.sleep(0.5)
     pw_field.clear()
     pw_field.send_keys(settings.sakai_password)
-    time.sleep(1)
     
-    # Submit
-    submit_btn = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
+    # Submit, then wait for the post-login navigation instead of a fixed sleep
+    submit_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit']")))
+    login_url = driver.current_url
     submit_btn.click()
-    time.sleep(5)
+    try:
+        wait.until(EC.url_changes(login_url))
+    except TimeoutException:
+        # A failed login stays on the same URL - still dump the network log
+        print("\nURL did not change after submit (login may have failed)")
     
     print(f"\nAfter submit:")
     print(f"  URL: {driver.current_url}")
@@ -137,9 +151,19 @@ try:
     # Get network logs
     print("\n=== Network Logs (login-related) ===")
     logs = driver.get_log("performance")
+    # Most entries are unrelated CDP events; skip them with cheap substring
+    # checks on the raw message before paying for a JSON parse
+    wanted_methods = ("Network.requestWillBeSent", "Network.responseReceived")
+    keywords = ("login", "session")  # also covers xlogin / relogin
     for log in logs:
+        raw = log["message"]
+        if not any(m in raw for m in wanted_methods):
+            continue
+        lowered = raw.lower()
+        if not any(k in lowered for k in keywords):
+            continue
         try:
-            msg = json.loads(log["message"])["message"]
+            msg = json.loads(raw)["message"]
             if msg["method"] == "Network.requestWillBeSent":
                 url = msg["params"]["request"]["url"]
                 method = msg["params"]["request"]["method"]
@@ -156,8 +180,6 @@ try:
                     print(f"  Response: {status} {url}")
         except:
             pass
-    
-    time.sleep(5)
 
 finally:
     driver.quit()
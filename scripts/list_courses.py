@@ -1,23 +1,34 @@
-import requests, json
+import json
+from concurrent.futures import ThreadPoolExecutor
 from sakai_bot.config import get_settings
+from sakai_login import load_session
+
+# Sakai accepts large _limit values, so most users fit in the first page
+PAGE_SIZE = 200
+# Pages requested concurrently once we know there is more than one
+PAGE_BATCH = 4
 
 s = get_settings()
-sess = requests.Session()
-sess.headers.update({"User-Agent": "Mozilla/5.0"})
-sess.post(f"{s.sakai_base_url}/portal/xlogin", data={"eid": s.sakai_username, "pw": s.sakai_password})
+sess = load_session()
+
+
+def fetch_page(start):
+    r = sess.get(f"{s.sakai_base_url}/direct/site.json?_limit={PAGE_SIZE}&_start={start}")
+    return json.loads(r.content).get("site_collection", [])
+
 
-# Try fetching with higher limit and pagination
-page = 1
-all_sites = []
-while True:
-    r = sess.get(f"{s.sakai_base_url}/direct/site.json?_limit=50&_start={len(all_sites)}")
-    sites = json.loads(r.text).get("site_collection", [])
-    if not sites:
-        break
-    all_sites.extend(sites)
-    if len(sites) < 50:
-        break
-    page += 1
+all_sites = fetch_page(0)
+if len(all_sites) == PAGE_SIZE:
+    # The total isn't reported, so fetch the following pages in parallel
+    # batches until one comes back short
+    with ThreadPoolExecutor(max_workers=PAGE_BATCH) as pool:
+        while True:
+            starts = [len(all_sites) + i * PAGE_SIZE for i in range(PAGE_BATCH)]
+            pages = list(pool.map(fetch_page, starts))
+            for sites in pages:
+                all_sites.extend(sites)
+            if any(len(sites) < PAGE_SIZE for sites in pages):
+                break
 
 print(f"Total: {len(all_sites)} courses\n")
 for i, site in enumerate(all_sites):
@@ -0,0 +1,179 @@
+"""Shared login for the debug scripts - reuses the Sakai session cookie between runs."""
+
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from http.cookiejar import LoadError, MozillaCookieJar
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from sakai_bot.config import get_settings
+
+# Per-user state (see _state_path): cookies-<user>.txt in the same
+# Mozilla format SakaiSession uses, cookies-<user>.lock and sites-<user>.json.
+# The lock is held while checking/refreshing the cookie jar so scripts started
+# together wait for one login instead of each POSTing /portal/xlogin
+STATE_DIR = Path.home() / ".sakai_bot"
+
+# Site membership only changes between semesters; pass --refresh to bypass
+SITES_TTL = 3600
+
+# Keep-alive pool shared by every request a script makes; large enough for the
+# thread-pool fan-outs, and retries transient 429/5xx (honoring Retry-After)
+POOL_SIZE = 32
+
+
+def new_session(user_agent="Mozilla/5.0", pool_size=POOL_SIZE, pool_block=False):
+    """Create a requests.Session with a tuned connection pool and retry policy."""
+    sess = requests.Session()
+    sess.headers.update({"User-Agent": user_agent})
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        pool_block=pool_block,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    )
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
+
+
+def _state_path(name):
+    """Path of a state file for the configured user, e.g. cookies-<user>.txt."""
+    stem, _, suffix = name.partition(".")
+    user = re.sub(r"[^\w.-]", "_", get_settings().sakai_username)
+    return STATE_DIR / f"{stem}-{user}.{suffix}"
+
+
+def save_cookies(sess):
+    """Persist the session cookies, readable only by the current user."""
+    path = _state_path("cookies.txt")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Create with 0600 up front; MozillaCookieJar.save keeps the mode
+    os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600))
+    jar = MozillaCookieJar(str(path))
+    for cookie in sess.cookies:
+        jar.set_cookie(cookie)
+    jar.save(ignore_discard=True, ignore_expires=True)
+
+
+def _load_cookies(sess):
+    """Add the saved cookies to sess; False if there are none (or unreadable)."""
+    jar = MozillaCookieJar(str(_state_path("cookies.txt")))
+    try:
+        jar.load(ignore_discard=True, ignore_expires=True)
+    except (LoadError, OSError):
+        return False
+    sess.cookies.update(jar)
+    return len(jar) > 0
+
+
+@contextmanager
+def _cookie_lock():
+    """Hold an exclusive, cross-process lock on the user's cookie lock file."""
+    lock_path = _state_path("cookies.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+            return
+        # msvcrt.LK_LOCK gives up after ~10 s, so keep waiting for the holder
+        while True:
+            try:
+                msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                pass
+        try:
+            yield
+        finally:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def load_session(sess=None):
+    """
+    Return a logged-in requests.Session.
+
+    Reuses the cookie jar from the previous run while Sakai still reports
+    a user for it; only then falls back to POSTing /portal/xlogin. An
+    exclusive lock on the user's lock file serializes this across processes, so a
+    batch of scripts launched together logs in once and the rest pick up
+    the saved cookies.
+    """
+    s = get_settings()
+    if sess is None:
+        sess = new_session()
+
+    with _cookie_lock():
+        if _load_cookies(sess):
+            r = sess.get(f"{s.sakai_base_url}/direct/session/current.json")
+            if r.status_code == 200 and json.loads(r.content).get("userId"):
+                return sess
+            sess.cookies.clear()
+
+        sess.post(
+            f"{s.sakai_base_url}/portal/xlogin",
+            data={"eid": s.sakai_username, "pw": s.sakai_password},
+        )
+        save_cookies(sess)
+    return sess
+
+
+def forget_sites():
+    """Drop the user's cached site lists, so the next get_sites() refetches."""
+    _state_path("sites.json").unlink(missing_ok=True)
+
+
+def _forget_sites_on_401(response, *args, **kwargs):
+    """Response hook: a 401 means the session died, so the cache is suspect."""
+    if response.status_code == 401:
+        forget_sites()
+
+
+def get_sites(sess, path="/direct/site.json"):
+    """
+    Return the site_collection for `path`, cached on disk for SITES_TTL seconds.
+
+    Skips the site-list request (the largest response the scripts fetch) on
+    most runs. Run a script with --refresh to force a fresh fetch. The cache
+    is also dropped whenever a request on sess (this fetch or a later probe)
+    comes back 401.
+    """
+    if _forget_sites_on_401 not in sess.hooks["response"]:
+        sess.hooks["response"].append(_forget_sites_on_401)
+
+    s = get_settings()
+    url = f"{s.sakai_base_url}{path}"
+    sites_path = _state_path("sites.json")
+    try:
+        cache = json.loads(sites_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        cache = {}
+    entry = cache.get(url)
+    if entry and "--refresh" not in sys.argv and time.time() - entry["fetched_at"] < SITES_TTL:
+        return entry["sites"]
+
+    r = sess.get(url)
+    r.raise_for_status()
+    sites = json.loads(r.content).get("site_collection", [])
+    cache[url] = {"fetched_at": time.time(), "sites": sites}
+    sites_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(sites_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.chmod(sites_path, 0o600)  # the mode above only applies to a new file
+    with os.fdopen(fd, "w") as f:
+        json.dump(cache, f)
+    return sites
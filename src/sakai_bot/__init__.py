@@ -2,7 +2,7 @@
 Sakai Monitoring Bot
 
 Automated monitoring for Sakai LMS - tracks announcements, assignments,
-and exams across all enrolled courses and sends WhatsApp notifications.
+and exams across all enrolled courses and sends Telegram notifications.
 """
 
 __version__ = "1.0.0"
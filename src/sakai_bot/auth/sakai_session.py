@@ -5,17 +5,58 @@ Handles login to Sakai LMS at sakai.ug.edu.gh using the native
 HTML form login at /portal/xlogin.
 """
 
+import json
 import logging
+import os
+import re
+import threading
 import time
+from functools import lru_cache
+from http.cookiejar import LoadError, MozillaCookieJar
+from pathlib import Path
 from urllib.parse import urljoin
 
+import lxml.html
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from sakai_bot.config import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
+# Shared parser for the login/verification pages; dropping comments and
+# whitespace-only text nodes keeps the trees small
+_HTML_PARSER = lxml.html.HTMLParser(remove_blank_text=True, remove_comments=True)
+
+# Sakai uses various names for CSRF tokens; also check the meta tag
+_CSRF_XPATH = etree.XPath(
+    "//input[@name='sakai_csrf_token' or @name='_csrf' or @name='csrf_token'"
+    " or @id='sakai_csrf_token']/@value"
+    " | //meta[@name='csrf-token']/@content"
+)
+_FORM_ACTION_XPATH = etree.XPath("(//form)[1]/@action")
+# Login-page indicators, scanned case-insensitively over the raw response bytes
+_FAILURE_RE = re.compile(
+    rb"invalid login|invalid credentials|login failed|incorrect password"
+    rb"|authentication failed|login required",
+    re.IGNORECASE,
+)
+_SUCCESS_RE = re.compile(rb"logout|my workspace|my sites", re.IGNORECASE)
+
+_USER_XPATH = etree.XPath(
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' currentUser ')"
+    " or @id='loginUser']"
+)
+
+
+@lru_cache(maxsize=256)
+def _join_url(base: str, path: str) -> str:
+    """Memoized urljoin for the paths _get_url can't simply append."""
+    return urljoin(base, path)
+
 
 class SakaiAuthError(Exception):
     """Raised when Sakai authentication fails."""
@@ -37,6 +78,25 @@ class SakaiSession:
     CAS/Shibboleth if the institution changes auth providers.
     """
 
+    __slots__ = (
+        "settings",
+        "base_url",
+        "session",
+        "_authenticated",
+        "_user_id",
+        "_url_login",
+        "_url_logout",
+        "_url_session",
+        "_login_form_cache",
+        "_cookie_file",
+        "_cookies_restored",
+        "_login_lock",
+        "_login_generation",
+    )
+
+    # Keep-alive pool size per host; sized for concurrent per-course fetches
+    POOL_SIZE = 32
+
     # User agent to mimic a real browser
     USER_AGENT = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -61,15 +121,56 @@ class SakaiSession:
                 "User-Agent": self.USER_AGENT,
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
                 "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate, br",
+                # No "br": brotli is not a dependency, so requests couldn't decode it
+                "Accept-Encoding": "gzip, deflate",
                 "Connection": "keep-alive",
                 "Upgrade-Insecure-Requests": "1",
             }
         )
 
+        # Larger keep-alive pool, plus retries with backoff for transient
+        # network and server errors. Failed connects are retried for every
+        # method; read errors and 5xx only for idempotent requests, so the
+        # login POST is never replayed once sent.
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_SIZE,
+            pool_maxsize=self.POOL_SIZE,
+            max_retries=Retry(
+                total=3,
+                connect=3,
+                read=3,
+                backoff_factor=1.0,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                raise_on_status=False,  # hand the last 5xx back to the caller
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
         self._authenticated = False
         self._user_id: str | None = None
 
+        # Serializes re-login when concurrent requests find the session expired;
+        # the generation counts re-logins so waiters can tell one already happened
+        self._login_lock = threading.Lock()
+        self._login_generation = 0
+
+        # Fixed endpoints, built once
+        self._url_login = self._get_url("/portal/xlogin")
+        self._url_logout = self._get_url("/portal/logout")
+        self._url_session = self._get_url("/direct/session/current.json")
+
+        # (form_action, csrf_token, fetched_at) from the last login page GET
+        self._login_form_cache: tuple[str, str | None, float] | None = None
+
+        # Optional on-disk cookie jar so a restart can resume the last session
+        self._cookie_file: Path | None = None
+        self._cookies_restored = False
+        if self.settings.sakai_cookie_file:
+            self._cookie_file = Path(self.settings.sakai_cookie_file).expanduser()
+            self._load_cookies()
+
     @property
     def is_authenticated(self) -> bool:
         """Check if session is authenticated."""
@@ -82,87 +183,90 @@ class SakaiSession:
 
     def _get_url(self, path: str) -> str:
         """Build full URL from path."""
-        return urljoin(self.base_url, path)
+        # base_url has no trailing slash (see Settings), so site-absolute
+        # paths - all the bot uses - can be appended directly
+        if path.startswith("/") and not path.startswith("//"):
+            return self.base_url + path
+        return _join_url(self.base_url, path)
+
+    def _load_cookies(self) -> None:
+        """Restore session cookies saved by a previous run, if any."""
+        if not self._cookie_file or not self._cookie_file.exists():
+            return
+
+        jar = MozillaCookieJar(str(self._cookie_file))
+        try:
+            jar.load(ignore_discard=True, ignore_expires=True)
+        except (LoadError, OSError) as e:
+            logger.warning(f"Ignoring unreadable cookie file {self._cookie_file}: {e}")
+            return
+
+        self.session.cookies.update(jar)
+        self._cookies_restored = len(jar) > 0
+
+    def _save_cookies(self) -> None:
+        """Persist session cookies (owner-readable only) for the next run."""
+        if not self._cookie_file:
+            return
 
-    def _extract_csrf_token(self, html: str) -> str | None:
+        try:
+            self._cookie_file.parent.mkdir(parents=True, exist_ok=True)
+            # Create with 0600 up front; MozillaCookieJar.save keeps the mode
+            os.close(os.open(self._cookie_file, os.O_WRONLY | os.O_CREAT, 0o600))
+            jar = MozillaCookieJar(str(self._cookie_file))
+            for cookie in self.session.cookies:
+                jar.set_cookie(cookie)
+            jar.save(ignore_discard=True, ignore_expires=True)
+        except OSError as e:
+            logger.warning(f"Could not save Sakai cookies to {self._cookie_file}: {e}")
+
+    def _extract_csrf_token(self, doc: lxml.html.HtmlElement) -> str | None:
         """
-        Extract CSRF token from HTML page if present.
+        Extract CSRF token from a parsed HTML page if present.
 
         Args:
-            html: HTML content to search
+            doc: lxml document to search
 
         Returns:
             str or None: CSRF token if found
         """
-        soup = BeautifulSoup(html, "lxml")
-
-        # Look for common CSRF token patterns
-        # Sakai uses various names for CSRF tokens
-        csrf_patterns = [
-            {"name": "sakai_csrf_token"},
-            {"name": "_csrf"},
-            {"name": "csrf_token"},
-            {"id": "sakai_csrf_token"},
-        ]
-
-        for pattern in csrf_patterns:
-            token_input = soup.find("input", pattern)
-            if token_input and token_input.get("value"):
-                return token_input["value"]
-
-        # Also check meta tags
-        csrf_meta = soup.find("meta", {"name": "csrf-token"})
-        if csrf_meta and csrf_meta.get("content"):
-            return csrf_meta["content"]
-
-        return None
+        return next((value for value in _CSRF_XPATH(doc) if value), None)
 
-    # Retry configuration for transient network errors
-    LOGIN_MAX_RETRIES = 3
-    LOGIN_RETRY_BACKOFF = 30  # seconds, doubles each retry
+    # Reuse the parsed login form for re-logins within this many seconds
+    LOGIN_FORM_TTL = 3600
 
     def login(self) -> bool:
         """
         Authenticate with Sakai using username/password.
 
-        Performs HTML form login at /portal/xlogin.
-        Retries up to LOGIN_MAX_RETRIES times on connection/timeout errors.
+        Performs HTML form login at /portal/xlogin. Transient connection,
+        timeout and 5xx errors are retried by the mounted HTTPAdapter.
 
         Returns:
             bool: True if login successful
 
         Raises:
-            SakaiAuthError: If login fails after all retries
+            SakaiAuthError: If login fails, or Sakai is unreachable after retries
         """
-        last_error: Exception | None = None
+        # Resume the session saved by a previous run if Sakai still accepts it
+        if self._cookies_restored:
+            self._cookies_restored = False
+            if self._check_session_api():
+                self._authenticated = True
+                logger.info(f"Resumed saved Sakai session for user: {self._user_id}")
+                return True
+            logger.info("Saved Sakai session expired, logging in again")
+            self.session.cookies.clear()
 
-        for attempt in range(1, self.LOGIN_MAX_RETRIES + 1):
-            try:
-                return self._attempt_login(attempt)
-            except requests.exceptions.ConnectionError as e:
-                last_error = e
-            except requests.exceptions.Timeout as e:
-                last_error = e
-            except SakaiAuthError:
-                raise  # credential / structural errors are not retryable
-
-            if attempt < self.LOGIN_MAX_RETRIES:
-                wait = self.LOGIN_RETRY_BACKOFF * (2 ** (attempt - 1))
-                logger.warning(
-                    f"Login attempt {attempt}/{self.LOGIN_MAX_RETRIES} failed "
-                    f"(transient network error). Retrying in {wait}s…"
-                )
-                time.sleep(wait)
-
-        raise SakaiAuthError(f"Login failed after {self.LOGIN_MAX_RETRIES} attempts: {last_error}")
-
-    def _attempt_login(self, attempt: int = 1) -> bool:
+        try:
+            return self._attempt_login()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise SakaiAuthError(f"Login failed, Sakai unreachable: {e}") from e
+
+    def _attempt_login(self) -> bool:
         """
         Single login attempt to Sakai.
 
-        Args:
-            attempt: Current attempt number (for logging)
-
         Returns:
             bool: True if login successful
 
@@ -171,67 +275,112 @@ class SakaiSession:
             requests.exceptions.ConnectionError: On network errors
             requests.exceptions.Timeout: On timeout errors
         """
-        logger.info(
-            f"Attempting login to {self.base_url} " f"(attempt {attempt}/{self.LOGIN_MAX_RETRIES})"
-        )
+        logger.info(f"Attempting login to {self.base_url}")
 
         try:
-            # Step 1: GET the login page to establish session and get any tokens
-            login_page_url = self._get_url("/portal/xlogin")
-            response = self.session.get(login_page_url, timeout=30)
-            response.raise_for_status()
+            # Step 1: Reuse the recently parsed login form, if any
+            cached = self._login_form_cache
+            if cached and time.time() - cached[2] < self.LOGIN_FORM_TTL:
+                try:
+                    if self._submit_login(cached[0], cached[1]):
+                        return True
+                except requests.exceptions.HTTPError:
+                    pass
+                # Stale form/token - fall through to a fresh login page
+                logger.info("Cached login form rejected, refetching login page")
+                self._login_form_cache = None
+
+            # Step 2: GET the login page to establish session and get any tokens
+            form_action, csrf_token = self._fetch_login_form()
+
+            # Steps 3-4: POST credentials and verify
+            if self._submit_login(form_action, csrf_token):
+                return True
+            raise SakaiAuthError(
+                "Login failed - credentials may be incorrect or login page structure changed"
+            )
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            raise  # already retried by the adapter; login() reports these
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Login request failed: {e}")
+            raise SakaiAuthError(f"Login request failed: {e}") from e
+
+    def _fetch_login_form(self) -> tuple[str, str | None]:
+        """
+        GET the login page and extract the form action and CSRF token.
+
+        The result is cached in _login_form_cache for LOGIN_FORM_TTL seconds.
 
-            # Extract any CSRF token
-            csrf_token = self._extract_csrf_token(response.text)
+        Returns:
+            Tuple of (form action URL, CSRF token or None)
+        """
+        login_page_url = self._url_login
+        # Read the whole body so the keep-alive connection goes back to the pool
+        response = self.session.get(login_page_url, timeout=30)
+        response.raise_for_status()
+        body = response.content
+
+        # Parse once for both the CSRF token and the form action
+        csrf_token = None
+        form_action = login_page_url  # default
+        if body:
+            doc = lxml.html.fromstring(body, parser=_HTML_PARSER)
+            csrf_token = self._extract_csrf_token(doc)
 
             # Extract the actual form action URL from the page
-            soup = BeautifulSoup(response.text, "lxml")
-            form = soup.find("form")
-            form_action = login_page_url  # default
-            if form and form.get("action"):
-                form_action = form["action"]
+            actions = _FORM_ACTION_XPATH(doc)
+            if actions and actions[0]:
+                form_action = actions[0]
                 if not form_action.startswith("http"):
                     form_action = self._get_url(form_action)
 
-            # Step 2: Prepare login form data
-            login_data = {
-                "eid": self.settings.sakai_username,
-                "pw": self.settings.sakai_password,
-                "submit": "Log in",  # Match exactly what the form uses
-            }
+        self._login_form_cache = (form_action, csrf_token, time.time())
+        return form_action, csrf_token
 
-            if csrf_token:
-                login_data["sakai_csrf_token"] = csrf_token
+    def _submit_login(self, form_action: str, csrf_token: str | None) -> bool:
+        """
+        POST credentials to the login form and verify the result.
 
-            # Step 3: POST login credentials to the form action URL
-            response = self.session.post(
-                form_action,
-                data=login_data,
-                timeout=30,
-                allow_redirects=True,
-            )
-            response.raise_for_status()
+        Args:
+            form_action: URL the login form posts to
+            csrf_token: CSRF token to include, if the page had one
 
-            # Step 4: Verify login success
-            if self._verify_login(response):
-                self._authenticated = True
-                logger.info(f"Login successful for user: {self.settings.sakai_username}")
-                return True
-            else:
-                raise SakaiAuthError(
-                    "Login failed - credentials may be incorrect or login page structure changed"
-                )
+        Returns:
+            bool: True if login successful
+        """
+        login_data = {
+            "eid": self.settings.sakai_username,
+            "pw": self.settings.sakai_password,
+            "submit": "Log in",  # Match exactly what the form uses
+        }
+
+        if csrf_token:
+            login_data["sakai_csrf_token"] = csrf_token
+
+        response = self.session.post(
+            form_action,
+            data=login_data,
+            timeout=30,
+            allow_redirects=True,
+        )
+        response.raise_for_status()
 
-        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
-            raise  # let the retry loop in login() handle these
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Login request failed: {e}")
-            raise SakaiAuthError(f"Login request failed: {e}") from e
+        if self._verify_login(response):
+            self._authenticated = True
+            logger.info(f"Login successful for user: {self.settings.sakai_username}")
+            self._save_cookies()
+            return True
+        return False
 
     def _verify_login(self, response: requests.Response) -> bool:
         """
         Verify that login was successful by checking the session API.
 
+        The session API is authoritative when it answers: a 200 returns its
+        verdict and a 401/403 fails. The login response HTML is only scanned
+        when the API is unreachable or erroring.
+
         Args:
             response: Response from login POST
 
@@ -239,66 +388,62 @@ class SakaiSession:
             bool: True if login appears successful
         """
         # Primary check: use Sakai's REST session API
+        verdict = self._check_session_api()
+        if verdict is not None:
+            return verdict
+
+        # Fallback: check for failure, then success indicators in the response
+        body = response.content
+        if _FAILURE_RE.search(body):
+            return False
+
+        if _SUCCESS_RE.search(body):
+            self._extract_user_info(body)
+            return True
+
+        return False
+
+    def _check_session_api(self) -> bool | None:
+        """
+        Ask Sakai's session API whether the current cookies are logged in.
+
+        Returns:
+            True/False for a definitive answer, or None if the API was
+            unreachable or erroring
+        """
         try:
-            session_resp = self.session.get(
-                self._get_url("/direct/session/current.json"),
-                timeout=15,
-            )
+            session_resp = self.session.get(self._url_session, timeout=15)
             if session_resp.status_code == 200:
-                import json
-
-                data = json.loads(session_resp.text)
+                data = json.loads(session_resp.content)
                 if data.get("userId"):
                     self._user_id = data.get("userEid") or data.get("userId")
                     return True
-        except Exception:
-            pass
-
-        # Fallback: check for failure indicators in the response
-        failure_indicators = [
-            "Invalid login",
-            "invalid credentials",
-            "Login failed",
-            "incorrect password",
-            "authentication failed",
-            "Login Required",
-        ]
-
-        response_text = response.text.lower()
-        for indicator in failure_indicators:
-            if indicator.lower() in response_text:
                 return False
+            if session_resp.status_code in (401, 403):
+                return False
+            logger.debug(f"Session API returned HTTP {session_resp.status_code}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.debug(f"Session API check failed: {e}")
+        return None
 
-        # Fallback: check for success indicators
-        success_indicators = [
-            "logout",
-            "my workspace",
-            "my sites",
-        ]
-
-        for indicator in success_indicators:
-            if indicator.lower() in response_text:
-                self._extract_user_info(response.text)
-                return True
-
-        return False
-
-    def _extract_user_info(self, html: str) -> None:
+    def _extract_user_info(self, html: str | bytes) -> None:
         """Extract user information from authenticated page."""
-        soup = BeautifulSoup(html, "lxml")
+        if not html:
+            return
 
         # Try to find user ID/name in the page
         # Sakai typically shows the logged-in user somewhere
-        user_element = soup.find(class_="currentUser") or soup.find(id="loginUser")
-        if user_element:
-            self._user_id = user_element.get_text(strip=True)
+        users = _USER_XPATH(lxml.html.fromstring(html, parser=_HTML_PARSER))
+        if users:
+            self._user_id = "".join(part.strip() for part in users[0].itertext())
 
-    def get(self, path: str, **kwargs) -> requests.Response:
+    def get(self, path: str, check: bool = False, **kwargs) -> requests.Response:
         """
         Make authenticated GET request.
 
         Args:
             path: URL path (will be joined with base URL)
+            check: Raise for 4xx/5xx responses (after any re-login)
             **kwargs: Additional arguments passed to requests.get
 
         Returns:
@@ -306,6 +451,7 @@ class SakaiSession:
 
         Raises:
             SakaiAuthError: If not authenticated
+            requests.HTTPError: If check is set and the response is an error
         """
         if not self._authenticated:
             raise SakaiAuthError("Not authenticated. Call login() first.")
@@ -313,15 +459,30 @@ class SakaiSession:
         url = self._get_url(path)
         kwargs.setdefault("timeout", 30)
 
+        generation = self._login_generation
         response = self.session.get(url, **kwargs)
 
         # Check if session expired (redirected to login)
         if "/xlogin" in response.url and "/portal/xlogin" not in path:
-            logger.warning("Session expired, attempting re-login")
-            self._authenticated = False
-            self.login()
-            response = self.session.get(url, **kwargs)
-
+            with self._login_lock:
+                if not self._authenticated:
+                    # A re-login by another thread failed; don't retry the credentials
+                    raise SakaiAuthError("Session expired and re-login failed")
+                if self._login_generation == generation:
+                    # Nobody has logged back in since our request: we do it, once
+                    logger.warning("Session expired, attempting re-login")
+                    try:
+                        logged_in = self.login()
+                    except SakaiAuthError:
+                        logged_in = False
+                    if not logged_in:
+                        self._authenticated = False
+                        raise SakaiAuthError("Session expired and re-login failed")
+                    self._login_generation += 1
+                response = self.session.get(url, **kwargs)
+
+        if check and not response.ok:
+            response.raise_for_status()
         return response
 
     def get_soup(self, path: str, **kwargs) -> BeautifulSoup:
@@ -335,9 +496,8 @@ class SakaiSession:
         Returns:
             BeautifulSoup: Parsed HTML
         """
-        response = self.get(path, **kwargs)
-        response.raise_for_status()
-        return BeautifulSoup(response.text, "lxml")
+        # Hand lxml the raw bytes; it honours the declared charset itself
+        return BeautifulSoup(self.get(path, check=True, **kwargs).content, "lxml")
 
     def get_json(self, path: str, **kwargs) -> dict:
         """
@@ -350,15 +510,16 @@ class SakaiSession:
         Returns:
             dict: Parsed JSON response
         """
-        response = self.get(path, **kwargs)
-        response.raise_for_status()
-        return response.json()
+        # Parse the raw bytes; skips requests' charset detection for .text
+        return json.loads(self.get(path, check=True, **kwargs).content)
 
     def logout(self) -> None:
-        """Log out from Sakai session."""
+        """Log out from Sakai session and discard any saved cookies."""
+        if self._cookie_file:
+            self._cookie_file.unlink(missing_ok=True)
         if self._authenticated:
             try:
-                self.session.get(self._get_url("/portal/logout"), timeout=10)
+                self.session.get(self._url_logout, timeout=10)
             except requests.exceptions.RequestException:
                 pass  # Ignore logout errors
             finally:
@@ -373,5 +534,8 @@ class SakaiSession:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Context manager exit - logout."""
+        """Context manager exit - logout, or keep the session if cookies persist."""
+        if self._cookie_file and self._authenticated:
+            self._save_cookies()
+            return
         self.logout()
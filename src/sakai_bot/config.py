@@ -25,6 +25,8 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        # Shared via get_settings(); nothing may mutate it after load
+        frozen=True,
     )
 
     # Sakai LMS Configuration
@@ -33,16 +35,32 @@ class Settings(BaseSettings):
     )
     sakai_username: str = Field(..., description="Sakai login username (student ID)")
     sakai_password: str = Field(..., description="Sakai login password")
+    sakai_cookie_file: str | None = Field(
+        default=None,
+        description=(
+            "Optional path to persist the Sakai session cookies between runs "
+            "(e.g. ~/.cache/sakai_bot/cookies.txt). Unset keeps them in memory only."
+        ),
+    )
 
     # Supabase Configuration
     supabase_url: str = Field(..., description="Supabase project URL")
     supabase_service_role_key: str = Field(
         ..., description="Supabase service role key (not anon key)"
     )
+    supabase_db_url: str | None = Field(
+        default=None,
+        description="Optional direct Postgres connection string, used by scripts/create_table.py",
+    )
 
     # Telegram Bot API Configuration
     telegram_bot_token: str = Field(..., description="Telegram Bot API token (from @BotFather)")
     telegram_chat_id: str = Field(..., description="Telegram chat ID (user, group, or channel)")
+    telegram_rate_per_sec: float = Field(
+        default=1.0,
+        gt=0,
+        description="Max notification messages per second (Telegram allows ~1/s per chat).",
+    )
 
     # Optional Configuration
     log_level: str = Field(default="INFO", description="Logging level")
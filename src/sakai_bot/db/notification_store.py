@@ -6,7 +6,7 @@ sending duplicate alerts for the same content.
 """
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from supabase import Client
 
@@ -17,7 +17,6 @@ from sakai_bot.models import (
     Exam,
     NotificationType,
     Resource,
-    SentNotification,
     SyntheticItem,
 )
 
@@ -29,6 +28,12 @@ NotifiableItem = Announcement | Assignment | Exam | Resource | SyntheticItem
 # Table name in Supabase
 TABLE_NAME = "sent_notifications"
 
+# Max dedup keys per .in_() lookup (they are sent in the request URL)
+LOOKUP_BATCH_SIZE = 100
+
+# Rows per page when bulk-loading sent keys (PostgREST caps responses at 1000)
+FETCH_PAGE_SIZE = 1000
+
 
 class NotificationStore:
     """
@@ -42,10 +47,15 @@ class NotificationStore:
     1. The dedup_key doesn't exist in the database, OR
     2. The dedup_key exists but content_hash has changed (content was updated)
 
-    Falls back to an in-memory set if the Supabase table doesn't exist,
-    so the bot still works without the database (just no persistence).
+    The content_hash last sent for each dedup_key is kept in memory, so
+    repeat checks within a run (e.g. reminders re-checking the same items)
+    skip the database; fetch_sent_keys() can bulk-load a whole notification
+    type up front. The same map is the fallback if the Supabase table
+    doesn't exist, so the bot still works without it (just no persistence).
     """
 
+    __slots__ = ("client", "table", "_table_exists", "_memory_store", "_loaded_scopes")
+
     def __init__(self, client: Client | None = None):
         """
         Initialize the notification store.
@@ -56,7 +66,11 @@ class NotificationStore:
         self.client = client or get_supabase_client()
         self.table = self.client.table(TABLE_NAME)
         self._table_exists: bool | None = None
-        self._memory_store: set = set()  # fallback
+        # dedup_key -> content_hash known to be sent (cache / fallback)
+        self._memory_store: dict[str, str] = {}
+        # Types whose sent rows are in _memory_store (see fetch_sent_keys),
+        # mapped to the course codes loaded (None = every course)
+        self._loaded_scopes: dict[NotificationType, frozenset[str] | None] = {}
 
     def _check_table(self) -> bool:
         """Check if the Supabase table exists (cached)."""
@@ -86,37 +100,134 @@ class NotificationStore:
         Returns:
             bool: True if this exact content has already been sent
         """
-        if not self._check_table():
-            # Fallback: in-memory dedup (only within this run)
-            key = f"{item.dedup_key}:{item.content_hash}"
-            return key in self._memory_store
+        return not self.filter_unsent([item])
 
-        try:
-            result = (
-                self.table.select("dedup_key, content_hash")
-                .eq("dedup_key", item.dedup_key)
-                .execute()
-            )
+    def filter_unsent(self, items: list[NotifiableItem]) -> list[NotifiableItem]:
+        """
+        Return the items that are new or whose content has changed.
 
-            if not result.data:
-                # Never sent before
-                return False
+        Items already known from memory (or from a fetch_sent_keys() preload
+        of their type) need no query; the rest are looked up with one .in_()
+        query per LOOKUP_BATCH_SIZE keys instead of one round-trip per item.
 
-            # Check if content has changed (updated item)
-            existing = result.data[0]
-            if existing["content_hash"] != item.content_hash:
-                logger.info(
-                    f"Content updated for {item.dedup_key}: "
-                    f"{existing['content_hash']} -> {item.content_hash}"
-                )
-                return False
+        Args:
+            items: Items to check
 
-            return True
+        Returns:
+            list: Items not yet sent with their current content, in input order
+        """
+        # Drop items already known to be sent this run without a DB query
+        items = [
+            item for item in items if self._memory_store.get(item.dedup_key) != item.content_hash
+        ]
+        if not items or not self._check_table():
+            # Without the table, the in-memory map is the only record (this run)
+            return items
+
+        try:
+            pending = (item.dedup_key for item in items if not self._is_preloaded(item))
+            keys = list(dict.fromkeys(pending))
+            existing: dict[str, str] = {}
+            for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+                result = (
+                    self.table.select("dedup_key, content_hash")
+                    .in_("dedup_key", keys[start : start + LOOKUP_BATCH_SIZE])
+                    .execute()
+                )
+                for row in result.data or []:
+                    existing[row["dedup_key"]] = row["content_hash"]
 
         except Exception as e:
             logger.error(f"Error checking notification status: {e}")
             # Fail open - assume not sent to avoid missing notifications
+            return list(items)
+
+        unsent = []
+        for item in items:
+            sent_hash = existing.get(item.dedup_key) or self._memory_store.get(item.dedup_key)
+            if sent_hash == item.content_hash:
+                self._memory_store[item.dedup_key] = item.content_hash
+                continue
+            if sent_hash is not None:
+                # Check if content has changed (updated item)
+                logger.info(
+                    f"Content updated for {item.dedup_key}: {sent_hash} -> {item.content_hash}"
+                )
+            unsent.append(item)
+        return unsent
+
+    def _is_preloaded(self, item: NotifiableItem) -> bool:
+        """Whether fetch_sent_keys() already loaded every sent record this item could match."""
+        if item.notification_type not in self._loaded_scopes:
             return False
+        scope = self._loaded_scopes[item.notification_type]
+        return scope is None or getattr(item, "course_code", None) in scope
+
+    def fetch_sent_keys(
+        self,
+        notification_type: NotificationType,
+        since: datetime | None = None,
+        course_codes: set[str] | None = None,
+    ) -> dict[str, str]:
+        """
+        Bulk-load sent records of one type into the in-memory cache.
+
+        Pages through the table once, ordered by id and until a page comes
+        back empty (the server may cap pages below FETCH_PAGE_SIZE), so a
+        following filter_unsent() for items of this type needs no further
+        queries. Restricting to the current courses keeps the load
+        proportional to this term rather than to the whole (ever-growing)
+        history; items from other courses still fall back to a lookup.
+        Without since, the loaded scope is treated as complete.
+
+        Args:
+            notification_type: Type of records to load
+            since: Optional lower bound on sent_at
+            course_codes: Optional course codes to restrict the load to
+
+        Returns:
+            dict: dedup_key -> content_hash for the loaded records
+                  (empty if the table is unavailable or the query failed)
+        """
+        codes = sorted(course_codes) if course_codes is not None else None
+        if codes == [] or not self._check_table():
+            return {}
+
+        sent: dict[str, str] = {}
+        try:
+            start = 0
+            while True:
+                query = self.table.select("dedup_key, content_hash").eq(
+                    "notification_type", notification_type.value
+                )
+                if codes is not None:
+                    query = query.in_("course_code", codes)
+                if since:
+                    query = query.gte("sent_at", since.isoformat())
+                rows = (
+                    query.order("id").range(start, start + FETCH_PAGE_SIZE - 1).execute().data or []
+                )
+                if not rows:
+                    break
+                for row in rows:
+                    sent[row["dedup_key"]] = row["content_hash"]
+                start += len(rows)
+
+        except Exception as e:
+            logger.error(f"Error loading sent {notification_type.value} records: {e}")
+            # filter_unsent falls back to per-batch lookups for this type
+            return {}
+
+        self._memory_store.update(sent)
+        if since is None:
+            scope = self._loaded_scopes.get(notification_type, frozenset())
+            if scope is not None:
+                # Widen (never narrow) what is known to be loaded
+                self._loaded_scopes[notification_type] = (
+                    None if codes is None else scope | frozenset(codes)
+                )
+        logger.debug(f"Loaded {len(sent)} sent {notification_type.value} records")
+        return sent
 
     def mark_as_sent(self, item: NotifiableItem) -> bool:
         """
@@ -130,31 +241,52 @@ class NotificationStore:
         Returns:
             bool: True if successfully recorded
         """
+        return self.mark_many_as_sent([item])
+
+    def mark_many_as_sent(self, items: list[NotifiableItem]) -> bool:
+        """
+        Record that notifications have been sent for these items.
+
+        Issues a single upsert for all records.
+
+        Args:
+            items: The items that were sent
+
+        Returns:
+            bool: True if successfully recorded
+        """
+        if not items:
+            return True
+
         # Always record in memory
-        key = f"{item.dedup_key}:{item.content_hash}"
-        self._memory_store.add(key)
+        for item in items:
+            self._memory_store[item.dedup_key] = item.content_hash
 
         if not self._check_table():
             return True
 
         try:
-            record = SentNotification(
-                notification_type=item.notification_type,
-                dedup_key=item.dedup_key,
-                content_hash=item.content_hash,
-                course_code=getattr(item, "course_code", None),
-                title=item.title,
-                sent_at=datetime.utcnow(),
-            )
+            # Rows in the SentNotification shape, built directly rather than via
+            # model_dump. sent_at stays in the payload: the column DEFAULT only
+            # applies on insert, and an upsert that updates a changed item must
+            # refresh it too (clear_old_records ages rows out by sent_at).
+            sent_at = datetime.now(timezone.utc).isoformat()
+            records = [
+                {
+                    "notification_type": item.notification_type.value,
+                    "dedup_key": item.dedup_key,
+                    "content_hash": item.content_hash,
+                    "course_code": getattr(item, "course_code", None),
+                    "title": item.title,
+                    "sent_at": sent_at,
+                }
+                for item in items
+            ]
 
             # Upsert based on dedup_key
-            data = record.model_dump(exclude={"id"})
-            # Convert datetime to ISO string for JSON serialization
-            if isinstance(data.get("sent_at"), datetime):
-                data["sent_at"] = data["sent_at"].isoformat()
-            self.table.upsert(data, on_conflict="dedup_key").execute()
+            self.table.upsert(records, on_conflict="dedup_key").execute()
 
-            logger.debug(f"Marked as sent: {item.dedup_key}")
+            logger.debug(f"Marked as sent: {', '.join(r['dedup_key'] for r in records)}")
             return True
 
         except Exception as e:
@@ -197,9 +329,7 @@ class NotificationStore:
             int: Number of records deleted
         """
         try:
-            from datetime import timedelta
-
-            cutoff = datetime.utcnow() - timedelta(days=days)
+            cutoff = datetime.now(timezone.utc) - timedelta(days=days)
 
             result = self.table.delete().lt("sent_at", cutoff.isoformat()).execute()
 
@@ -12,13 +12,17 @@ Coordinates the full monitoring workflow:
 
 import logging
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
 
 from sakai_bot.auth import SakaiSession
 from sakai_bot.auth.sakai_session import SakaiAuthError
 from sakai_bot.config import get_settings, setup_logging
 from sakai_bot.db import NotificationStore
-from sakai_bot.models import Announcement, Assignment, Exam, Resource
+from sakai_bot.models import Announcement, Assignment, Exam, NotificationType, Resource
 from sakai_bot.notify import (
     DigestService,
     MessageFormatter,
@@ -61,6 +65,10 @@ class SakaiMonitor:
     with deduplication and notifications.
     """
 
+    # Scrape steps run concurrently (announcements, assignments, resources,
+    # then exams once announcements are in)
+    SCRAPE_WORKERS = 3
+
     def __init__(self):
         """Initialize the monitor with all components."""
         self.settings = get_settings()
@@ -79,6 +87,8 @@ class SakaiMonitor:
             "reminders_sent": 0,
             "errors": 0,
         }
+        # Scrape steps and the sender thread update stats concurrently
+        self._stats_lock = threading.Lock()
 
     def run(self) -> bool:
         """
@@ -91,6 +101,10 @@ class SakaiMonitor:
         logger.info("Starting Sakai Monitoring Bot")
         logger.info("=" * 50)
 
+        # One clock reading for the whole run, so urgency labels, reminder
+        # windows and the digest window all agree
+        now = datetime.now(timezone.utc)
+
         try:
             # Use context manager for automatic login/logout
             with SakaiSession() as session:
@@ -106,29 +120,59 @@ class SakaiMonitor:
                 self.stats["courses_scraped"] = len(courses)
                 logger.info(f"Found {len(courses)} enrolled courses")
 
-                # Step 2: Scrape announcements
-                all_announcements, new_announcements = self._process_announcements(session, courses)
+                # Steps 2-5 are independent HTTP-bound scrapes over the shared
+                # session, so they overlap instead of running back to back.
+                # Step 6 is pipelined: each step's new items are queued on a
+                # single sender thread as soon as the step finishes, so the
+                # first notifications go out while later steps still scrape
+                # (and messages keep the announcements, assignments, exams,
+                # resources order).
+                with (
+                    ThreadPoolExecutor(max_workers=self.SCRAPE_WORKERS) as executor,
+                    ThreadPoolExecutor(max_workers=1) as sender,
+                ):
+                    # Step 2: Scrape announcements
+                    announcements = executor.submit(self._process_announcements, session, courses)
+
+                    # Step 3: Scrape assignments
+                    assignments = executor.submit(self._process_assignments, session, courses)
+
+                    # Step 5: Scrape new course resources
+                    resources = executor.submit(self._process_resources, session, courses)
+
+                    # Step 4: Detect exams (from ALL announcements, so exams
+                    # announced weeks ago still feed reminders and the digest)
+                    all_announcements, new_announcements = announcements.result()
+                    exams = executor.submit(
+                        self._process_exams, session, courses, all_announcements
+                    )
+                    sender.submit(
+                        self._notify, new_announcements, self.formatter.format_announcement
+                    )
 
-                # Step 3: Scrape assignments
-                all_assignments, new_assignments = self._process_assignments(session, courses)
+                    all_assignments, new_assignments = assignments.result()
+                    sender.submit(
+                        self._notify,
+                        new_assignments,
+                        partial(self.formatter.format_assignment, now=now),
+                    )
 
-                # Step 4: Detect exams (from ALL announcements, so exams
-                # announced weeks ago still feed reminders and the digest)
-                all_exams, new_exams = self._process_exams(session, courses, all_announcements)
+                    all_exams, new_exams = exams.result()
+                    sender.submit(
+                        self._notify, new_exams, partial(self.formatter.format_exam, now=now)
+                    )
 
-                # Step 5: Scrape new course resources
-                new_resources = self._process_resources(session, courses)
+                    new_resources = resources.result()
+                    sender.submit(self._notify, new_resources, self.formatter.format_resource)
 
-                # Step 6: Send notifications for new items
-                self._send_notifications(
-                    new_announcements, new_assignments, new_exams, new_resources
-                )
+                # Step 6 (cont.): Summary once everything is sent
+                self._send_summary(new_announcements, new_assignments, new_exams, new_resources)
 
                 # Step 7: Deadline reminders (24h/3h before due)
-                self._send_reminders(all_assignments, all_exams)
+                self._send_reminders(all_assignments, all_exams, now)
 
                 # Step 8: Weekly digest (Sunday evenings)
-                self._maybe_send_digest(all_assignments, all_exams)
+                self._maybe_send_digest(all_assignments, all_exams, now)
 
             # Log summary
             self._log_summary()
@@ -138,7 +182,7 @@ class SakaiMonitor:
 
         except Exception as e:
             logger.error(f"Monitor failed with error: {e}", exc_info=True)
-            self.stats["errors"] += 1
+            self._add_stat("errors")
 
             # Try to send error notification
             try:
@@ -149,6 +193,11 @@ class SakaiMonitor:
 
             return False
 
+    def _add_stat(self, key: str, count: int = 1) -> None:
+        """Increment a run counter (safe from the scrape and sender threads)."""
+        with self._stats_lock:
+            self.stats[key] += count
+
     def _scrape_courses(self, session: SakaiSession) -> list:
         """Scrape enrolled courses, warning if filtering had to fall back."""
         scraper = CourseScraper(session)
@@ -156,6 +205,19 @@ class SakaiMonitor:
         notify_fallback(self.telegram, scraper.fallback_reason, len(courses))
         return courses
 
+    def _filter_new(self, items: list, notification_type: NotificationType, courses: list) -> list:
+        """
+        Return the new/updated items, preloading sent records of their type.
+
+        One paged query per type, limited to the monitored courses, replaces
+        per-item (or per-batch) lookups.
+        """
+        if items:
+            self.notification_store.fetch_sent_keys(
+                notification_type, course_codes={course.code for course in courses}
+            )
+        return self.notification_store.filter_unsent(items)
+
     def _process_announcements(
         self, session: SakaiSession, courses: list
     ) -> tuple[list[Announcement], list[Announcement]]:
@@ -174,10 +236,9 @@ class SakaiMonitor:
         self.stats["announcements_found"] = len(all_announcements)
 
         # Filter to new/updated only
-        new_announcements = []
-        for announcement in all_announcements:
-            if not self.notification_store.has_been_sent(announcement):
-                new_announcements.append(announcement)
+        new_announcements = self._filter_new(
+            all_announcements, NotificationType.ANNOUNCEMENT, courses
+        )
 
         logger.info(
             f"Announcements: {len(all_announcements)} total, " f"{len(new_announcements)} new"
@@ -202,10 +263,7 @@ class SakaiMonitor:
         self.stats["assignments_found"] = len(all_assignments)
 
         # Filter to new/updated only
-        new_assignments = []
-        for assignment in all_assignments:
-            if not self.notification_store.has_been_sent(assignment):
-                new_assignments.append(assignment)
+        new_assignments = self._filter_new(all_assignments, NotificationType.ASSIGNMENT, courses)
 
         logger.info(f"Assignments: {len(all_assignments)} total, " f"{len(new_assignments)} new")
         return all_assignments, new_assignments
@@ -232,10 +290,7 @@ class SakaiMonitor:
         self.stats["exams_found"] = len(all_exams)
 
         # Filter to new only
-        new_exams = []
-        for exam in all_exams:
-            if not self.notification_store.has_been_sent(exam):
-                new_exams.append(exam)
+        new_exams = self._filter_new(all_exams, NotificationType.EXAM, courses)
 
         logger.info(f"Exams: {len(all_exams)} total, " f"{len(new_exams)} new")
         return all_exams, new_exams
@@ -258,19 +313,18 @@ class SakaiMonitor:
             all_resources = scraper.scrape(courses)
             self.stats["resources_found"] = len(all_resources)
 
-            new_resources = []
-            for resource in all_resources:
-                if not self.notification_store.has_been_sent(resource):
-                    new_resources.append(resource)
+            new_resources = self._filter_new(all_resources, NotificationType.RESOURCE, courses)
 
             logger.info(f"Resources: {len(all_resources)} recent, " f"{len(new_resources)} new")
             return new_resources
         except Exception as e:
             logger.error(f"Resource scraping failed: {e}")
-            self.stats["errors"] += 1
+            self._add_stat("errors")
             return []
 
-    def _send_reminders(self, assignments: list[Assignment], exams: list[Exam]) -> None:
+    def _send_reminders(
+        self, assignments: list[Assignment], exams: list[Exam], now: datetime | None = None
+    ) -> None:
         """
         Send deadline reminders for items approaching their due date.
 
@@ -278,15 +332,17 @@ class SakaiMonitor:
         """
         try:
             service = ReminderService(self.notification_store, self.telegram, self.formatter)
-            sent = service.send_reminders(assignments, exams)
+            sent = service.send_reminders(assignments, exams, now=now)
             self.stats["reminders_sent"] = sent
             if sent:
                 logger.info(f"Sent {sent} deadline reminder(s)")
         except Exception as e:
             logger.error(f"Deadline reminders failed: {e}")
-            self.stats["errors"] += 1
+            self._add_stat("errors")
 
-    def _maybe_send_digest(self, assignments: list[Assignment], exams: list[Exam]) -> None:
+    def _maybe_send_digest(
+        self, assignments: list[Assignment], exams: list[Exam], now: datetime | None = None
+    ) -> None:
         """
         Send the weekly digest if we're in the Sunday-evening window.
 
@@ -294,12 +350,41 @@ class SakaiMonitor:
         """
         try:
             service = DigestService(self.notification_store, self.telegram, self.formatter)
-            service.maybe_send(assignments, exams)
+            service.maybe_send(assignments, exams, now=now)
         except Exception as e:
             logger.error(f"Weekly digest failed: {e}")
-            self.stats["errors"] += 1
+            self._add_stat("errors")
+
+    def _notify(self, items: list, format_message) -> int:
+        """
+        Format and send notifications for one kind of new item.
 
-    def _send_notifications(
+        Never raises — runs on the sender thread, where an error would
+        otherwise go unnoticed.
+
+        Args:
+            items: New items to notify, in send order
+            format_message: Formatter method for this kind of item
+
+        Returns:
+            int: Number of notifications sent and recorded
+        """
+        if not items:
+            return 0
+        if not self.telegram.can_send():
+            # Unsent items stay unrecorded, so the next run picks them up
+            logger.warning(f"Telegram is throttling; deferring {len(items)} notification(s)")
+            return 0
+        try:
+            pairs = [(item, format_message(item)) for item in items]
+        except Exception as e:
+            logger.error(f"Error formatting notifications: {e}")
+            self._add_stat("errors")
+            return 0
+        logger.info(f"Sending {len(pairs)} notifications...")
+        return self._send_and_record(pairs)
+
+    def _send_summary(
         self,
         announcements: list[Announcement],
         assignments: list[Assignment],
@@ -307,13 +392,13 @@ class SakaiMonitor:
         resources: list[Resource] | None = None,
     ) -> None:
         """
-        Send Telegram notifications for new items.
+        Send the run summary after the new-item notifications.
 
         Args:
-            announcements: New announcements to notify
-            assignments: New assignments to notify
-            exams: New exams to notify
-            resources: New course resources to notify
+            announcements: New announcements notified
+            assignments: New assignments notified
+            exams: New exams notified
+            resources: New course resources notified
         """
         resources = resources or []
         total_new = len(announcements) + len(assignments) + len(exams) + len(resources)
@@ -322,36 +407,6 @@ class SakaiMonitor:
             logger.info("No new items to notify")
             return
 
-        logger.info(f"Sending {total_new} notifications...")
-
-        # Send announcements
-        for announcement in announcements:
-            self._send_and_record(
-                announcement,
-                self.formatter.format_announcement(announcement),
-            )
-
-        # Send assignments
-        for assignment in assignments:
-            self._send_and_record(
-                assignment,
-                self.formatter.format_assignment(assignment),
-            )
-
-        # Send exams
-        for exam in exams:
-            self._send_and_record(
-                exam,
-                self.formatter.format_exam(exam),
-            )
-
-        # Send new course files
-        for resource in resources:
-            self._send_and_record(
-                resource,
-                self.formatter.format_resource(resource),
-            )
-
         # Send summary if multiple items
         if total_new > 1:
             summary = self.formatter.format_summary(
@@ -360,32 +415,38 @@ class SakaiMonitor:
                 exams_count=len(exams),
                 resources_count=len(resources),
             )
-            self.telegram.send_message(summary)
+            # Paced and throttle-aware like the notifications before it
+            self.telegram.send_batch([summary])
 
-    def _send_and_record(self, item, message: str) -> bool:
+    def _send_and_record(self, pairs: list[tuple]) -> int:
         """
-        Send notification and record if successful.
+        Send a batch of notifications and record the ones that went through.
 
         Args:
-            item: The item being notified (Announcement, Assignment, or Exam)
-            message: Formatted message to send
+            pairs: (item, formatted message) tuples, in send order
 
         Returns:
-            bool: True if sent and recorded successfully
+            int: Number of notifications sent and recorded
         """
         try:
-            if self.telegram.send_message(message):
-                self.notification_store.mark_as_sent(item)
-                self.stats["notifications_sent"] += 1
+            results = self.telegram.send_batch([message for _, message in pairs])
+        except Exception as e:
+            logger.error(f"Error sending notifications: {e}")
+            self._add_stat("errors")
+            return 0
+
+        sent = []
+        for (item, _), ok in zip(pairs, results, strict=True):
+            if ok:
+                sent.append(item)
                 logger.debug(f"Sent notification for: {item.title}")
-                return True
             else:
                 logger.warning(f"Failed to send notification for: {item.title}")
-                return False
-        except Exception as e:
-            logger.error(f"Error sending notification: {e}")
-            self.stats["errors"] += 1
-            return False
+
+        if sent:
+            self.notification_store.mark_many_as_sent(sent)
+        self._add_stat("notifications_sent", len(sent))
+        return len(sent)
 
     def _log_summary(self) -> None:
         """Log execution summary."""
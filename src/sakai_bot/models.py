@@ -10,9 +10,21 @@ Defines Pydantic models for all scraped entities:
 
 from datetime import datetime, timezone
 from enum import Enum
+from functools import cached_property
 from hashlib import sha256
 
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
+
+
+def short_hash(value: str) -> str:
+    """
+    16-hex-char digest used for content_hash values.
+
+    Kept on truncated sha256 so hashes match the rows already stored in
+    sent_notifications; changing the algorithm would make every item look
+    updated and re-send it once.
+    """
+    return sha256(value.encode()).hexdigest()[:16]
 
 
 class NotificationType(str, Enum):
@@ -36,6 +48,25 @@ class AssignmentStatus(str, Enum):
     CLOSED = "closed"
 
 
+class ScrapedItem(BaseModel):
+    """
+    Base for scraped, notifiable entities.
+
+    Frozen, so dedup_key/content_hash can be computed once per item
+    (cached_property) instead of on every access.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    def model_copy(self, *, update=None, deep: bool = False):
+        """Copy the item, dropping cached keys/hashes that the update invalidates."""
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied.__dict__.pop("dedup_key", None)
+            copied.__dict__.pop("content_hash", None)
+        return copied
+
+
 class Course(BaseModel):
     """
     Represents an enrolled course in Sakai.
@@ -48,6 +79,8 @@ class Course(BaseModel):
         term: parsed term token, e.g. "S2-2526"
     """
 
+    model_config = ConfigDict(frozen=True)
+
     site_id: str
     code: str
     title: str
@@ -61,7 +94,7 @@ class Course(BaseModel):
         return f"{self.code}: {self.title}" if self.code else self.title
 
 
-class Announcement(BaseModel):
+class Announcement(ScrapedItem):
     """
     Represents a course announcement.
 
@@ -86,24 +119,24 @@ class Announcement(BaseModel):
     url: str | None = None
 
     @computed_field
-    @property
+    @cached_property
     def dedup_key(self) -> str:
         """Unique key for deduplication."""
         return f"announcement:{self.id}"
 
     @computed_field
-    @property
+    @cached_property
     def content_hash(self) -> str:
         """Hash of content for change detection."""
         content_str = f"{self.title}|{self.content}"
-        return sha256(content_str.encode()).hexdigest()[:16]
+        return short_hash(content_str)
 
     @property
     def notification_type(self) -> NotificationType:
         return NotificationType.ANNOUNCEMENT
 
 
-class Assignment(BaseModel):
+class Assignment(ScrapedItem):
     """
     Represents a course assignment.
 
@@ -133,17 +166,17 @@ class Assignment(BaseModel):
     url: str | None = None
 
     @computed_field
-    @property
+    @cached_property
     def dedup_key(self) -> str:
         """Unique key for deduplication."""
         return f"assignment:{self.id}"
 
     @computed_field
-    @property
+    @cached_property
     def content_hash(self) -> str:
         """Hash of content for change detection."""
         content_str = f"{self.title}|{self.due_date}|{self.status}"
-        return sha256(content_str.encode()).hexdigest()[:16]
+        return short_hash(content_str)
 
     @property
     def notification_type(self) -> NotificationType:
@@ -157,7 +190,7 @@ class Assignment(BaseModel):
         return self.due_date > datetime.now(timezone.utc)
 
 
-class Exam(BaseModel):
+class Exam(ScrapedItem):
     """
     Represents an exam or quiz.
 
@@ -195,25 +228,31 @@ class Exam(BaseModel):
     url: str | None = None
     notes: str | None = None
 
+    @field_validator("exam_type")
+    @classmethod
+    def _normalize_exam_type(cls, value: str) -> str:
+        """Store exam types lowercase so lookups need no per-use .lower()."""
+        return value.lower()
+
     @computed_field
-    @property
+    @cached_property
     def dedup_key(self) -> str:
         """Unique key for deduplication."""
         return f"exam:{self.id}"
 
     @computed_field
-    @property
+    @cached_property
     def content_hash(self) -> str:
         """Hash of content for change detection."""
         content_str = f"{self.title}|{self.exam_date}|{self.exam_time}"
-        return sha256(content_str.encode()).hexdigest()[:16]
+        return short_hash(content_str)
 
     @property
     def notification_type(self) -> NotificationType:
         return NotificationType.EXAM
 
 
-class Resource(BaseModel):
+class Resource(ScrapedItem):
     """
     Represents a file in a course's Resources tool.
 
@@ -242,17 +281,17 @@ class Resource(BaseModel):
     url: str | None = None
 
     @computed_field
-    @property
+    @cached_property
     def dedup_key(self) -> str:
         """Unique key for deduplication."""
         return f"resource:{self.id}"
 
     @computed_field
-    @property
+    @cached_property
     def content_hash(self) -> str:
         """Hash of content for change detection (re-uploads notify as updates)."""
         content_str = f"{self.title}|{self.modified_at}|{self.size_bytes}"
-        return sha256(content_str.encode()).hexdigest()[:16]
+        return short_hash(content_str)
 
     @property
     def notification_type(self) -> NotificationType:
@@ -265,6 +304,8 @@ class SyntheticItem(BaseModel):
     such as deadline reminders and weekly digests.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     dedup_key: str
     content_hash: str
     notification_type: NotificationType
@@ -279,13 +320,12 @@ class SentNotification(BaseModel):
     Stored in Supabase to prevent duplicate alerts.
     """
 
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     id: int | None = None
     notification_type: NotificationType
     dedup_key: str = Field(..., description="Unique identifier for this notification")
     content_hash: str = Field(..., description="Hash of content for change detection")
     course_code: str | None = None
     title: str
-    sent_at: datetime = Field(default_factory=datetime.utcnow)
-
-    class Config:
-        from_attributes = True
+    sent_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
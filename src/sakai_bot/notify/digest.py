@@ -9,12 +9,11 @@ though multiple scheduled runs land in the window.
 
 import logging
 from datetime import datetime, timedelta, timezone
-from hashlib import sha256
 
 from dateutil.tz import gettz
 
 from sakai_bot.config import get_settings
-from sakai_bot.models import Assignment, Exam, NotificationType, SyntheticItem
+from sakai_bot.models import Assignment, Exam, NotificationType, SyntheticItem, short_hash
 from sakai_bot.notify.reminders import DONE_STATUSES
 
 logger = logging.getLogger(__name__)
@@ -76,7 +75,8 @@ class DigestService:
         upcoming_assignments, upcoming_exams = self._upcoming(assignments, exams, now)
         message = self.formatter.format_digest(upcoming_assignments, upcoming_exams)
 
-        if self.notifier.send_message(message):
+        # send_batch honors the notifier's pacing and throttle back-off
+        if self.notifier.send_batch([message]) == [True]:
             self.store.mark_as_sent(record)
             logger.info(
                 f"Sent weekly digest: {len(upcoming_assignments)} assignment(s), "
@@ -99,7 +99,7 @@ class DigestService:
         key = f"digest:{local_now.date().isoformat()}"
         return SyntheticItem(
             dedup_key=key,
-            content_hash=sha256(key.encode()).hexdigest()[:16],
+            content_hash=short_hash(key),
             notification_type=NotificationType.DIGEST,
             title="Weekly digest",
         )
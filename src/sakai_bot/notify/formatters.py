@@ -4,6 +4,7 @@ Message formatters for Telegram notifications.
 Formats scraped data into clean, readable Telegram messages.
 """
 
+from bisect import bisect_left
 from datetime import datetime, timezone
 
 from sakai_bot.models import Announcement, Assignment, Exam, Resource
@@ -20,12 +21,38 @@ class MessageFormatter:
     # Maximum message length for Telegram (4096 chars, but we leave buffer)
     MAX_LENGTH = 3500
 
+    # Rule between a message's details and its body text
+    SEPARATOR = "─" * 20
+
+    # Heading emoji per (lowercase) exam type
+    EXAM_TYPE_EMOJI = {
+        "exam": "📝",
+        "midterm": "📊",
+        "final": "🎓",
+        "quiz": "❓",
+        "test": "✍️",
+    }
+
+    # Assignment urgency: DUE_LABELS[i] applies while days left <= DUE_THRESHOLDS[i],
+    # the last label beyond every threshold
+    DUE_THRESHOLDS = (-1, 0, 2, 7)
+    DUE_LABELS = ("⚠️ OVERDUE", "🔴 DUE TODAY", "🟠 DUE SOON", "🟡", "🟢")
+
     @staticmethod
     def _truncate(text: str, max_length: int = 500) -> str:
         """Truncate text with ellipsis if too long."""
         if len(text) <= max_length:
             return text
-        return text[: max_length - 3].rsplit(" ", 1)[0] + "..."
+        # Cut at the last space that leaves room for the ellipsis (hard cut if none)
+        cut = text.rfind(" ", 0, max_length - 3)
+        if cut <= 0:
+            cut = max_length - 3
+        return text[:cut] + "..."
+
+    @staticmethod
+    def _opt(prefix: str, value: object) -> str:
+        """Return prefix + value for an optional message part, or "" if value is empty."""
+        return f"{prefix}{value}" if value else ""
 
     @staticmethod
     def _format_datetime(dt: datetime | None) -> str:
@@ -44,7 +71,7 @@ class MessageFormatter:
     @classmethod
     def format_announcement(cls, announcement: Announcement) -> str:
         """
-        Format an announcement for WhatsApp notification.
+        Format an announcement for Telegram notification.
 
         Args:
             announcement: The announcement to format
@@ -53,133 +80,80 @@ class MessageFormatter:
             str: Formatted message string
         """
         # Clean and truncate content
-        content = announcement.content.strip()
-        content = cls._truncate(content, 800)
+        content = cls._truncate(announcement.content.strip(), 800)
 
-        # Build message
-        lines = [
-            "📢 *NEW ANNOUNCEMENT*",
-            "",
-            f"📚 *Course:* {announcement.course_code}",
-            f"📝 *Title:* {announcement.title}",
-        ]
-
-        if announcement.author:
-            lines.append(f"👤 *Posted by:* {announcement.author}")
-
-        if announcement.posted_at:
-            lines.append(f"🕐 *Date:* {cls._format_datetime(announcement.posted_at)}")
-
-        lines.extend(
-            [
-                "",
-                "─" * 20,
-                "",
-                content,
-            ]
+        # Optional lines, each with its leading separator
+        author = cls._opt("\n👤 *Posted by:* ", announcement.author)
+        posted = cls._opt(
+            "\n🕐 *Date:* ",
+            announcement.posted_at and cls._format_datetime(announcement.posted_at),
         )
+        link = cls._opt("\n\n🔗 View: ", announcement.url)
 
-        if announcement.url:
-            lines.extend(
-                [
-                    "",
-                    f"🔗 View: {announcement.url}",
-                ]
-            )
-
-        return "\n".join(lines)
+        return (
+            "📢 *NEW ANNOUNCEMENT*\n\n"
+            f"📚 *Course:* {announcement.course_code}\n"
+            f"📝 *Title:* {announcement.title}{author}{posted}\n\n"
+            f"{cls.SEPARATOR}\n\n"
+            f"{content}{link}"
+        )
 
     @classmethod
-    def format_assignment(cls, assignment: Assignment) -> str:
+    def format_assignment(cls, assignment: Assignment, now: datetime | None = None) -> str:
         """
-        Format an assignment for WhatsApp notification.
+        Format an assignment for Telegram notification.
 
         Args:
             assignment: The assignment to format
+            now: Current time for the urgency indicator (defaults to now)
 
         Returns:
             str: Formatted message string
         """
-        lines = [
-            "📋 *NEW ASSIGNMENT*",
-            "",
-            f"📚 *Course:* {assignment.course_code}",
-            f"📝 *Title:* {assignment.title}",
-        ]
-
+        due = ""
         if assignment.due_date:
             # Add urgency indicator
-            days_until = (assignment.due_date - datetime.now(timezone.utc)).days
-            if days_until < 0:
-                urgency = "⚠️ OVERDUE"
-            elif days_until == 0:
-                urgency = "🔴 DUE TODAY"
-            elif days_until <= 2:
-                urgency = "🟠 DUE SOON"
-            elif days_until <= 7:
-                urgency = "🟡"
-            else:
-                urgency = "🟢"
-
-            lines.append(f"📅 *Due:* {cls._format_datetime(assignment.due_date)} {urgency}")
+            days_until = (assignment.due_date - (now or datetime.now(timezone.utc))).days
+            urgency = cls.DUE_LABELS[bisect_left(cls.DUE_THRESHOLDS, days_until)]
+            due = f"\n📅 *Due:* {cls._format_datetime(assignment.due_date)} {urgency}"
 
-        if assignment.open_date:
-            lines.append(f"📆 *Opens:* {cls._format_datetime(assignment.open_date)}")
-
-        if assignment.max_points:
-            lines.append(f"🎯 *Points:* {assignment.max_points}")
-
-        if assignment.description:
-            description = cls._truncate(assignment.description, 500)
-            lines.extend(
-                [
-                    "",
-                    "─" * 20,
-                    "",
-                    description,
-                ]
-            )
-
-        if assignment.url:
-            lines.extend(
-                [
-                    "",
-                    f"🔗 View: {assignment.url}",
-                ]
-            )
+        opens = cls._opt(
+            "\n📆 *Opens:* ",
+            assignment.open_date and cls._format_datetime(assignment.open_date),
+        )
+        points = cls._opt("\n🎯 *Points:* ", assignment.max_points)
+        description = cls._opt(
+            f"\n\n{cls.SEPARATOR}\n\n",
+            assignment.description and cls._truncate(assignment.description, 500),
+        )
+        link = cls._opt("\n\n🔗 View: ", assignment.url)
 
-        return "\n".join(lines)
+        return (
+            "📋 *NEW ASSIGNMENT*\n\n"
+            f"📚 *Course:* {assignment.course_code}\n"
+            f"📝 *Title:* {assignment.title}"
+            f"{due}{opens}{points}{description}{link}"
+        )
 
     @classmethod
-    def format_exam(cls, exam: Exam) -> str:
+    def format_exam(cls, exam: Exam, now: datetime | None = None) -> str:
         """
-        Format an exam notification for WhatsApp.
+        Format an exam notification for Telegram.
 
         Args:
             exam: The exam to format
+            now: Current time for the countdown (defaults to now)
 
         Returns:
             str: Formatted message string
         """
         # Choose emoji based on exam type
-        type_emoji = {
-            "exam": "📝",
-            "midterm": "📊",
-            "final": "🎓",
-            "quiz": "❓",
-            "test": "✍️",
-        }.get(exam.exam_type.lower(), "📝")
-
-        lines = [
-            f"🚨 *{exam.exam_type.upper()} ALERT* {type_emoji}",
-            "",
-            f"📚 *Course:* {exam.course_code}",
-            f"📝 *Title:* {exam.title}",
-        ]
+        type_emoji = cls.EXAM_TYPE_EMOJI.get(exam.exam_type, "📝")
 
+        date = ""
         if exam.exam_date:
             # Calculate days until exam
-            days_until = (exam.exam_date - datetime.now(timezone.utc)).days
+            days_until = (exam.exam_date - (now or datetime.now(timezone.utc))).days
             if days_until < 0:
                 countdown = "(Already passed)"
             elif days_until == 0:
@@ -191,44 +165,29 @@ class MessageFormatter:
             else:
                 countdown = f"In {days_until} days"
 
-            lines.append(f"📅 *Date:* {cls._format_date(exam.exam_date)} {countdown}")
-
-        if exam.exam_time:
-            lines.append(f"🕐 *Time:* {exam.exam_time}")
-
-        if exam.location:
-            lines.append(f"📍 *Location:* {exam.location}")
+            date = f"\n📅 *Date:* {cls._format_date(exam.exam_date)} {countdown}"
 
+        duration = ""
         if exam.duration_minutes:
-            hours = exam.duration_minutes // 60
-            minutes = exam.duration_minutes % 60
-            duration_str = ""
-            if hours:
-                duration_str += f"{hours}h "
-            if minutes:
-                duration_str += f"{minutes}m"
-            lines.append(f"⏱️ *Duration:* {duration_str.strip()}")
-
-        if exam.notes:
-            notes = cls._truncate(exam.notes, 300)
-            lines.extend(
-                [
-                    "",
-                    "─" * 20,
-                    "",
-                    f"📌 {notes}",
-                ]
+            hours, minutes = divmod(exam.duration_minutes, 60)
+            duration_str = " ".join(
+                part for part in (hours and f"{hours}h", minutes and f"{minutes}m") if part
             )
+            duration = f"\n⏱️ *Duration:* {duration_str}"
 
-        if exam.url:
-            lines.extend(
-                [
-                    "",
-                    f"🔗 More info: {exam.url}",
-                ]
-            )
+        time = cls._opt("\n🕐 *Time:* ", exam.exam_time)
+        location = cls._opt("\n📍 *Location:* ", exam.location)
+        notes = cls._opt(
+            f"\n\n{cls.SEPARATOR}\n\n📌 ", exam.notes and cls._truncate(exam.notes, 300)
+        )
+        link = cls._opt("\n\n🔗 More info: ", exam.url)
 
-        return "\n".join(lines)
+        return (
+            f"🚨 *{exam.exam_type.upper()} ALERT* {type_emoji}\n\n"
+            f"📚 *Course:* {exam.course_code}\n"
+            f"📝 *Title:* {exam.title}"
+            f"{date}{time}{location}{duration}{notes}{link}"
+        )
 
     @classmethod
     def format_reminder(
@@ -9,10 +9,9 @@ tracked via the notification store with keys like
 
 import logging
 from datetime import datetime, timezone
-from hashlib import sha256
 
 from sakai_bot.config import get_settings
-from sakai_bot.models import Assignment, AssignmentStatus, Exam, SyntheticItem
+from sakai_bot.models import Assignment, AssignmentStatus, Exam, SyntheticItem, short_hash
 
 logger = logging.getLogger(__name__)
 
@@ -66,30 +65,46 @@ class ReminderService:
             int: Number of reminders sent
         """
         now = now or datetime.now(timezone.utc)
-        sent = 0
 
+        # (item, due, hours_left, applicable windows, tightest-window record)
+        candidates = []
         for item, due in self._items_with_deadlines(assignments, exams):
             hours_left = (due - now).total_seconds() / 3600
             if hours_left <= 0:
                 continue
 
             applicable = [h for h in self.hours if hours_left <= h]
-            if not applicable:
-                continue
+            if applicable:
+                record = self._record(item, min(applicable), due)
+                candidates.append((item, due, hours_left, applicable, record))
 
-            tightest = min(applicable)
-            if self.store.has_been_sent(self._record(item, tightest, due)):
-                continue
+        # One dedup lookup for every candidate's tightest window
+        unsent = {r.dedup_key for r in self.store.filter_unsent([c[-1] for c in candidates])}
 
-            message = self.formatter.format_reminder(item, due, hours_left)
-            if self.notifier.send_message(message):
+        due_now = [c for c in candidates if c[-1].dedup_key in unsent]
+        if not due_now:
+            return 0
+
+        # One paced, throttle-aware batch for all reminders
+        messages = [
+            self.formatter.format_reminder(item, due, hours_left)
+            for item, due, hours_left, _, _ in due_now
+        ]
+        results = self.notifier.send_batch(messages)
+
+        sent = 0
+        records: list[SyntheticItem] = []
+        for (item, due, _, applicable, _), ok in zip(due_now, results, strict=True):
+            if ok:
                 sent += 1
                 # Mark every applicable window so a wider reminder never
                 # fires after a tighter one was already sent.
-                for h in applicable:
-                    self.store.mark_as_sent(self._record(item, h, due))
-                logger.info(f"Sent {tightest}h reminder for: {item.title}")
+                records.extend(self._record(item, h, due) for h in applicable)
+                logger.info(f"Sent {min(applicable)}h reminder for: {item.title}")
 
+        # Record all delivered reminders in a single upsert
+        if records:
+            self.store.mark_many_as_sent(records)
         return sent
 
     def _items_with_deadlines(
@@ -126,7 +141,7 @@ class ReminderService:
         """Build the dedup record for one reminder window of one item."""
         return SyntheticItem(
             dedup_key=f"reminder:{item.dedup_key}:{hours}h",
-            content_hash=sha256(due.isoformat().encode()).hexdigest()[:16],
+            content_hash=short_hash(due.isoformat()),
             notification_type=item.notification_type,
             title=item.title,
             course_code=item.course_code,
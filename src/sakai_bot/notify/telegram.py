@@ -5,9 +5,13 @@ Sends notifications via Telegram Bot API.
 https://core.telegram.org/bots/api
 """
 
+import json
 import logging
+import time
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from sakai_bot.config import get_settings
 
@@ -25,6 +29,10 @@ class TelegramNotifier:
     chat (user, group, or channel).
     """
 
+    # Longest Telegram-requested back-off (HTTP 429 retry_after) to sit out
+    # within a run; beyond it, remaining messages are left for the next run
+    MAX_THROTTLE_WAIT = 30.0
+
     def __init__(
         self,
         token: str | None = None,
@@ -41,10 +49,34 @@ class TelegramNotifier:
 
         self.token = token or settings.telegram_bot_token
         self.chat_id = chat_id or settings.telegram_chat_id
+        self.rate_per_sec = settings.telegram_rate_per_sec
+        # Earliest monotonic time for the next paced send (kept across batches)
+        self._next_slot = 0.0
+        # Monotonic time until which Telegram asked us to stop sending (429)
+        self._throttled_until = 0.0
 
         self.api_url = TELEGRAM_API_URL.format(token=self.token)
         self.session = requests.Session()
 
+        # Keep-alive connection to api.telegram.org, reused across sends.
+        # Failed connects are retried for every method; 5xx only for GET, so
+        # a sendMessage that may have been delivered is never posted twice
+        # (429 is handled by _throttle, not retried here).
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=3,
+                connect=3,
+                read=0,
+                backoff_factor=0.3,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+
     def send_message(self, message: str, parse_mode: str = "Markdown") -> bool:
         """
         Send a text message via Telegram.
@@ -56,9 +88,7 @@ class TelegramNotifier:
         Returns:
             bool: True if message was sent successfully
         """
-        # Convert WhatsApp-style formatting to Telegram Markdown
-        # WhatsApp uses *bold* which is the same as Telegram Markdown
-
+        # Messages use *bold*, which Telegram Markdown renders as-is
         payload = {
             "chat_id": self.chat_id,
             "text": message,
@@ -70,7 +100,7 @@ class TelegramNotifier:
             response = self.session.post(self.api_url, json=payload, timeout=30)
 
             if response.status_code == 200:
-                data = response.json()
+                data = json.loads(response.content)
                 if data.get("ok"):
                     message_id = data.get("result", {}).get("message_id", "unknown")
                     logger.info(f"Telegram message sent successfully: {message_id}")
@@ -78,6 +108,9 @@ class TelegramNotifier:
                 else:
                     logger.error(f"Telegram API error: {data.get('description')}")
                     return False
+            elif response.status_code == 429:
+                self._throttle(response)
+                return False
             else:
                 logger.error(f"Telegram API error: {response.status_code} - {response.text}")
                 return False
@@ -89,11 +122,72 @@ class TelegramNotifier:
             logger.error(f"Telegram API request failed: {e}")
             return False
 
+    def _throttle(self, response: requests.Response) -> None:
+        """Record the back-off from a 429 so later sends wait or are deferred."""
+        try:
+            data = json.loads(response.content)
+            retry_after = float(data.get("parameters", {}).get("retry_after", 1))
+        except (ValueError, AttributeError):
+            retry_after = 1.0
+        logger.warning(f"Telegram rate limit hit, retry after {retry_after:.0f}s")
+        self._throttled_until = time.monotonic() + retry_after
+        self._next_slot = max(self._next_slot, self._throttled_until)
+
+    def can_send(self) -> bool:
+        """
+        Check whether a message could go out in this run.
+
+        False while Telegram's requested back-off runs longer than
+        MAX_THROTTLE_WAIT, so callers can skip formatting and leave the
+        items unsent for the next run.
+        """
+        return self._throttled_until - time.monotonic() <= self.MAX_THROTTLE_WAIT
+
+    def send_batch(
+        self,
+        messages: list[str],
+        parse_mode: str = "Markdown",
+        rate_per_sec: float | None = None,
+    ) -> list[bool]:
+        """
+        Send several messages in order, paced to stay under Telegram's limits.
+
+        Telegram throttles bots that burst messages into one chat (HTTP 429),
+        so sends are spaced at least 1/rate_per_sec seconds apart, including
+        across consecutive batches. After a long back-off request the rest of
+        the batch is not sent (reported as failed).
+
+        Args:
+            messages: Message texts to send
+            parse_mode: Message formatting mode
+            rate_per_sec: Max messages per second (defaults to settings)
+
+        Returns:
+            list[bool]: Per-message success, in the same order as messages
+        """
+        interval = 1.0 / (rate_per_sec or self.rate_per_sec)
+        results = []
+
+        for i, message in enumerate(messages):
+            if not self.can_send():
+                deferred = len(messages) - i
+                logger.warning(f"Telegram is throttling; deferring {deferred} message(s)")
+                results.extend([False] * deferred)
+                break
+            wait = self._next_slot - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._next_slot = max(self._next_slot, time.monotonic()) + interval
+            results.append(self.send_message(message, parse_mode))
+
+        return results
+
     def send_long_message(self, message: str, parse_mode: str = "Markdown") -> bool:
         """
         Send a long message, splitting if necessary.
 
-        Telegram has a 4096 character limit per message.
+        Telegram has a 4096 character limit per message. Paragraphs are
+        packed greedily, so the fewest parts are sent.
 
         Args:
             message: The message text to send
@@ -107,30 +201,30 @@ class TelegramNotifier:
         if len(message) <= MAX_LENGTH:
             return self.send_message(message, parse_mode)
 
-        # Split by double newlines to preserve formatting
+        # Split by double newlines to preserve formatting. Paragraphs are
+        # buffered and joined once per part, tracking the joined length.
         parts = []
-        current_part = ""
+        buffer: list[str] = []
+        buffer_len = 0
 
         for paragraph in message.split("\n\n"):
-            if len(current_part) + len(paragraph) + 2 > MAX_LENGTH:
-                if current_part:
-                    parts.append(current_part.strip())
-                current_part = paragraph
+            if buffer_len + len(paragraph) + 2 > MAX_LENGTH:
+                if buffer_len:
+                    parts.append("\n\n".join(buffer).strip())
+                buffer, buffer_len = [paragraph], len(paragraph)
+            elif buffer_len:
+                buffer.append(paragraph)
+                buffer_len += len(paragraph) + 2
             else:
-                current_part += "\n\n" + paragraph if current_part else paragraph
+                buffer, buffer_len = [paragraph], len(paragraph)
 
-        if current_part:
-            parts.append(current_part.strip())
+        if buffer_len:
+            parts.append("\n\n".join(buffer).strip())
 
-        # Send all parts
-        success = True
-        for i, part in enumerate(parts):
-            if i > 0:
-                part = f"(...continued)\n\n{part}"
-            if not self.send_message(part, parse_mode):
-                success = False
-
-        return success
+        # Send all parts in order, paced like any other batch (concurrent
+        # posts could reach the chat out of order)
+        parts = [parts[0]] + [f"(...continued)\n\n{part}" for part in parts[1:]]
+        return all(self.send_batch(parts, parse_mode))
 
     def test_connection(self) -> bool:
         """
@@ -144,8 +238,11 @@ class TelegramNotifier:
             response = self.session.get(
                 f"https://api.telegram.org/bot{self.token}/getMe", timeout=10
             )
-            if response.status_code == 200 and response.json().get("ok"):
-                bot_info = response.json().get("result", {})
+            if response.status_code != 200:
+                return False
+            data = json.loads(response.content)
+            if data.get("ok"):
+                bot_info = data.get("result", {})
                 logger.info(f"Connected to Telegram bot: @{bot_info.get('username')}")
                 return True
             return False
@@ -8,8 +8,6 @@ announcements from all enrolled courses.
 import logging
 from datetime import datetime, timezone
 
-from bs4 import BeautifulSoup
-
 from sakai_bot.auth.sakai_session import SakaiSession
 from sakai_bot.models import Announcement, Course
 from sakai_bot.scrapers.base import BaseScraper
@@ -26,6 +24,10 @@ class AnnouncementScraper(BaseScraper):
     supplementary source.
     """
 
+    # REST paths, formatted per course
+    SITE_PATH = "/direct/announcement/site/{site_id}.json?n=100&_limit=100"
+    USER_PATH = "/direct/announcement/user.json?n=100&_limit=100"
+
     def __init__(self, session: SakaiSession):
         """Initialize announcement scraper."""
         super().__init__(session)
@@ -44,25 +46,15 @@ class AnnouncementScraper(BaseScraper):
         seen_ids: set = set()
 
         # Scrape per-course announcements via REST API
-        for course in courses:
-            try:
-                announcements = self._scrape_course_announcements(course)
-                for ann in announcements:
-                    if ann.id not in seen_ids:
-                        seen_ids.add(ann.id)
-                        all_announcements.append(ann)
-                logger.debug(f"Found {len(announcements)} announcements in {course.code}")
-            except Exception as e:
-                logger.error(f"Error scraping announcements for {course.code}: {e}")
-                continue
+        per_course = self.map_courses(self._scrape_course_announcements, courses, "announcements")
+        for course, announcements in zip(courses, per_course, strict=True):
+            self._dedupe_extend(all_announcements, seen_ids, announcements)
+            logger.debug(f"Found {len(announcements)} announcements in {course.code}")
 
         # Also fetch user-level announcements (catches cross-listed/global ones)
         try:
             user_announcements = self._scrape_user_announcements(courses)
-            for ann in user_announcements:
-                if ann.id not in seen_ids:
-                    seen_ids.add(ann.id)
-                    all_announcements.append(ann)
+            self._dedupe_extend(all_announcements, seen_ids, user_announcements)
         except Exception as e:
             logger.error(f"Error scraping user announcements: {e}")
 
@@ -80,9 +72,7 @@ class AnnouncementScraper(BaseScraper):
             List[Announcement]: Announcements from this course
         """
         try:
-            data = self.session.get_json(
-                f"/direct/announcement/site/{course.site_id}.json" f"?n=100&_limit=100"
-            )
+            data = self.session.get_json(self.SITE_PATH.format(site_id=course.site_id))
         except Exception as e:
             logger.debug(f"Could not get announcements for {course.code}: {e}")
             return []
@@ -100,27 +90,25 @@ class AnnouncementScraper(BaseScraper):
         Scrape the user-level announcements feed.
 
         Args:
-            courses: Known courses (for matching site IDs/titles)
+            courses: Known courses (matched by site ID, then title)
 
         Returns:
             List[Announcement]: User-level announcements
         """
         try:
-            data = self.session.get_json("/direct/announcement/user.json?n=100&_limit=100")
+            data = self.session.get_json(self.USER_PATH)
         except Exception:
             return []
 
-        # Build lookup maps
-        site_map: dict = {}
-        for c in courses:
-            site_map[c.site_id] = c
-            site_map[c.title] = c
+        # Lookup maps, built once for the whole feed
+        site_map = {c.site_id: c for c in courses}
+        title_map = {c.title: c for c in courses}
 
         announcements: list[Announcement] = []
         for item in data.get("announcement_collection", []):
             site_id = item.get("siteId", "")
             site_title = item.get("siteTitle", "")
-            course = site_map.get(site_id) or site_map.get(site_title)
+            course = site_map.get(site_id) or title_map.get(site_title)
 
             # Only include announcements from our filtered courses
             if not course:
@@ -187,10 +175,3 @@ class AnnouncementScraper(BaseScraper):
             return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc)
         except (ValueError, TypeError, OSError):
             return None
-
-    def _clean_html(self, html: str) -> str:
-        """Strip HTML tags and return clean text."""
-        if not html:
-            return ""
-        soup = BeautifulSoup(html, "lxml")
-        return soup.get_text(separator="\n", strip=True)
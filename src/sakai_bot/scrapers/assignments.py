@@ -8,8 +8,6 @@ assignments and deadlines from all enrolled courses.
 import logging
 from datetime import datetime, timezone
 
-from bs4 import BeautifulSoup
-
 from sakai_bot.auth.sakai_session import SakaiSession
 from sakai_bot.models import Assignment, AssignmentStatus, Course
 from sakai_bot.scrapers.base import BaseScraper
@@ -25,6 +23,17 @@ class AssignmentScraper(BaseScraper):
     assignments, with /direct/assignment/my.json as a global source.
     """
 
+    # REST paths, formatted per course
+    SITE_PATH = "/direct/assignment/site/{site_id}.json"
+    USER_PATH = "/direct/assignment/my.json"
+
+    # Submission states read from the API status string, checked in order
+    STATUS_KEYWORDS = (
+        ("submitted", AssignmentStatus.SUBMITTED),
+        ("graded", AssignmentStatus.GRADED),
+        ("returned", AssignmentStatus.GRADED),
+    )
+
     def __init__(self, session: SakaiSession):
         """Initialize assignment scraper."""
         super().__init__(session)
@@ -41,68 +50,65 @@ class AssignmentScraper(BaseScraper):
         """
         all_assignments: list[Assignment] = []
         seen_ids: set = set()
+        now = datetime.now(timezone.utc)
 
-        # Build site_id -> course map
+        # Build site_id -> course map once; shared by both passes below
         site_map = {c.site_id: c for c in courses}
 
         # Primary: get all assignments via user endpoint
         try:
-            data = self.session.get_json("/direct/assignment/my.json")
-            for item in data.get("assignment_collection", []):
-                # Only include assignments from our filtered courses
-                context = item.get("context", "")
-                if context not in site_map:
-                    continue
-                assignment = self._parse_api_assignment(item, site_map)
-                if assignment and assignment.id not in seen_ids:
-                    seen_ids.add(assignment.id)
-                    all_assignments.append(assignment)
+            data = self.session.get_json(self.USER_PATH)
+            # Only include assignments from our filtered courses
+            parsed = (
+                self._parse_api_assignment(item, site_map, now)
+                for item in data.get("assignment_collection", [])
+                if item.get("context", "") in site_map
+            )
+            self._dedupe_extend(all_assignments, seen_ids, filter(None, parsed))
         except Exception as e:
-            logger.error(f"Error fetching /direct/assignment/my.json: {e}")
+            logger.error(f"Error fetching {self.USER_PATH}: {e}")
 
             # Fallback: per-course scraping
-            for course in courses:
-                try:
-                    assignments = self._scrape_course_assignments(course)
-                    for a in assignments:
-                        if a.id not in seen_ids:
-                            seen_ids.add(a.id)
-                            all_assignments.append(a)
-                except Exception as exc:
-                    logger.error(f"Error scraping assignments for {course.code}: {exc}")
+            for assignments in self.map_courses(
+                lambda course: self._scrape_course_assignments(course, site_map, now),
+                courses,
+                "assignments",
+            ):
+                self._dedupe_extend(all_assignments, seen_ids, assignments)
 
         logger.info(f"Total assignments scraped: {len(all_assignments)}")
         return all_assignments
 
-    def _scrape_course_assignments(self, course: Course) -> list[Assignment]:
+    def _scrape_course_assignments(
+        self, course: Course, site_map: dict[str, Course], now: datetime
+    ) -> list[Assignment]:
         """
         Scrape assignments for a single course via the REST API.
 
         Args:
             course: Course to scrape
+            site_map: Mapping of site_id -> Course
+            now: Time the status of each assignment is judged at
 
         Returns:
             List[Assignment]: Assignments from this course
         """
         try:
-            data = self.session.get_json(f"/direct/assignment/site/{course.site_id}.json")
+            data = self.session.get_json(self.SITE_PATH.format(site_id=course.site_id))
         except Exception as e:
             logger.debug(f"Could not get assignments for {course.code}: {e}")
             return []
 
-        site_map = {course.site_id: course}
         assignments: list[Assignment] = []
         for item in data.get("assignment_collection", []):
-            a = self._parse_api_assignment(item, site_map)
+            a = self._parse_api_assignment(item, site_map, now)
             if a:
                 assignments.append(a)
 
         return assignments
 
     def _parse_api_assignment(
-        self,
-        item: dict,
-        site_map: dict,
+        self, item: dict, site_map: dict[str, Course], now: datetime
     ) -> Assignment | None:
         """
         Parse an assignment from the REST API response.
@@ -110,6 +116,7 @@ class AssignmentScraper(BaseScraper):
         Args:
             item: Assignment dict from API
             site_map: Mapping of site_id -> Course
+            now: Time the status is judged at (one value per scrape)
 
         Returns:
             Assignment or None if parsing fails
@@ -137,7 +144,7 @@ class AssignmentScraper(BaseScraper):
         close_date = self._parse_date_field(item.get("closeTime") or item.get("closeTimeString"))
 
         # Determine status
-        status = self._determine_status(item, due_date, close_date)
+        status = self._determine_status(item, due_date, close_date, now)
 
         # Max points
         max_points = None
@@ -146,9 +153,8 @@ class AssignmentScraper(BaseScraper):
         except (ValueError, TypeError):
             pass
 
-        # Build URL
-        site_id = item.get("context", "")
-        url = f"{self.session.base_url}/portal/site/{site_id}" if site_id else None
+        # Build URL (the context is the site ID)
+        url = f"{self.session.base_url}/portal/site/{context}" if context else None
 
         return Assignment(
             id=str(assign_id),
@@ -200,17 +206,15 @@ class AssignmentScraper(BaseScraper):
         item: dict,
         due_date: datetime | None,
         close_date: datetime | None,
+        now: datetime,
     ) -> AssignmentStatus:
         """Determine assignment status from API data."""
         # Check submission status from API
         status_str = (item.get("status") or "").lower()
-
-        if "submitted" in status_str:
-            return AssignmentStatus.SUBMITTED
-        if "graded" in status_str or "returned" in status_str:
-            return AssignmentStatus.GRADED
-
-        now = datetime.now(tz=timezone.utc)
+        if status_str:
+            for keyword, status in self.STATUS_KEYWORDS:
+                if keyword in status_str:
+                    return status
 
         if close_date and now > close_date:
             return AssignmentStatus.CLOSED
@@ -218,10 +222,3 @@ class AssignmentScraper(BaseScraper):
             return AssignmentStatus.LATE
 
         return AssignmentStatus.NOT_STARTED
-
-    def _clean_html(self, html: str) -> str:
-        """Strip HTML tags and return clean text."""
-        if not html:
-            return ""
-        soup = BeautifulSoup(html, "lxml")
-        return soup.get_text(separator="\n", strip=True)
@@ -7,17 +7,77 @@ Provides common functionality for all Sakai scrapers.
 import logging
 import re
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
+import lxml.html
 from dateutil import parser as date_parser
 from dateutil.tz import gettz
+from lxml import etree
 
 from sakai_bot.auth.sakai_session import SakaiSession
 from sakai_bot.config import get_settings
+from sakai_bot.models import Course
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; parse_date/clean_text/extract_course_code run per item
+_WHITESPACE_RE = re.compile(r"\s+")
+_DATE_PREFIX_RE = re.compile(r"Due:|Posted:|Opens:|Closes:|Date:")
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_COURSE_CODE_RES = (
+    re.compile(r"([A-Z]{2,4}[- ]?\d{3}[A-Z]?)", re.IGNORECASE),  # CSCD 101, CS101, DCIT-103
+    re.compile(r"([A-Z]{2,4}\s+\d{3})", re.IGNORECASE),  # CSCD 101
+)
+
+# Visible text nodes: comments are not text() nodes; script/style/template
+# content is skipped (as BeautifulSoup's get_text does)
+_VISIBLE_TEXT = "//text()[not(ancestor::script or ancestor::style or ancestor::template)]"
+
+
+@lru_cache(maxsize=2048)
+def _html_to_text(html: str) -> str:
+    """
+    Text of an HTML fragment, one stripped text node per line.
+
+    Cached because API bodies often repeat verbatim (the same announcement
+    in the site and user feeds, shared boilerplate). Uses lxml's default
+    parser, which is per-thread, so it is safe from the scraper pools.
+    """
+    try:
+        root = lxml.html.document_fromstring(html)
+    except etree.ParserError:  # whitespace-only / empty document
+        return ""
+    return "\n".join(text.strip() for text in root.xpath(_VISIBLE_TEXT) if text.strip())
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_text(date_str: str) -> datetime | None:
+    """Parse a date string for BaseScraper.parse_date (None if unparseable)."""
+    # Clean up the string and remove common prefixes
+    date_str = _DATE_PREFIX_RE.sub("", _WHITESPACE_RE.sub(" ", date_str.strip())).strip()
+
+    try:
+        parsed = None
+        if _ISO_DATE_RE.match(date_str):
+            try:
+                parsed = datetime.fromisoformat(
+                    date_str[:-1] + "+00:00" if date_str.endswith("Z") else date_str
+                )
+            except ValueError:
+                pass  # not strict ISO (e.g. trailing text); let dateutil try
+        if parsed is None:
+            # Use dateutil parser for flexibility
+            parsed = date_parser.parse(date_str, fuzzy=True)
+        return parsed
+
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Could not parse date '{date_str}': {e}")
+        return None
+
 
 class BaseScraper(ABC):
     """
@@ -27,6 +87,12 @@ class BaseScraper(ABC):
     and HTML extraction.
     """
 
+    # Per-course requests in flight at once (kept within SakaiSession.POOL_SIZE)
+    COURSE_WORKERS = 8
+
+    # Portal page of one tool in a course site
+    TOOL_PATH = "/portal/site/{site_id}/tool-reset/{tool}"
+
     def __init__(self, session: SakaiSession):
         """
         Initialize scraper with authenticated session.
@@ -43,11 +109,54 @@ class BaseScraper(ABC):
         """Scrape data - implemented by subclasses."""
         pass
 
+    @staticmethod
+    def _dedupe_extend(target: list, seen: set, items: Iterable) -> None:
+        """Append the items whose id is not yet in seen, recording each new id."""
+        for item in items:
+            if item.id not in seen:
+                seen.add(item.id)
+                target.append(item)
+
+    def map_courses(
+        self, fetch: Callable[[Course], list], courses: list[Course], what: str
+    ) -> list[list]:
+        """
+        Run a per-course fetch for every course concurrently.
+
+        Fetches share the session's keep-alive pool on up to COURSE_WORKERS
+        threads, so the network waits overlap instead of adding up.
+
+        Args:
+            fetch: Function returning the items for one course
+            courses: Courses to fetch
+            what: Item name for error logs (e.g. "announcements")
+
+        Returns:
+            list: One result list per course, in course order (empty on error)
+        """
+
+        def fetch_one(course: Course) -> list:
+            try:
+                return fetch(course)
+            except Exception as e:
+                logger.error(f"Error scraping {what} for {course.code}: {e}")
+                return []
+
+        if not courses:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self.COURSE_WORKERS, len(courses))) as executor:
+            return list(executor.map(fetch_one, courses))
+
     def parse_date(self, date_str: str | None) -> datetime | None:
         """
         Parse date string to datetime.
 
-        Handles various date formats commonly used in Sakai.
+        Handles various date formats commonly used in Sakai. ISO 8601
+        strings (what the REST API mostly returns) take the fast
+        datetime.fromisoformat path; anything else goes to dateutil.
+        Results are memoized per string, since due dates and the dates
+        quoted in announcements repeat across items.
 
         Args:
             date_str: Date string to parse
@@ -57,28 +166,27 @@ class BaseScraper(ABC):
         """
         if not date_str:
             return None
+        parsed = _parse_date_text(date_str)
 
-        # Clean up the string
-        date_str = date_str.strip()
-        date_str = re.sub(r"\s+", " ", date_str)
-
-        # Remove common prefixes
-        for prefix in ["Due:", "Posted:", "Opens:", "Closes:", "Date:"]:
-            date_str = date_str.replace(prefix, "").strip()
+        # Apply timezone if not present
+        if parsed is not None and parsed.tzinfo is None and self.timezone:
+            parsed = parsed.replace(tzinfo=self.timezone)
 
-        try:
-            # Use dateutil parser for flexibility
-            parsed = date_parser.parse(date_str, fuzzy=True)
+        return parsed
 
-            # Apply timezone if not present
-            if parsed.tzinfo is None and self.timezone:
-                parsed = parsed.replace(tzinfo=self.timezone)
-
-            return parsed
+    def _clean_html(self, html: str) -> str:
+        """
+        Strip HTML tags and return clean text.
 
-        except (ValueError, TypeError) as e:
-            logger.debug(f"Could not parse date '{date_str}': {e}")
-            return None
+        Plain-text bodies (no tags, entities, NULs or BOMs, which the parser
+        would rewrite) skip the parser; only its line-ending normalization
+        is applied so the result is the same.
+        """
+        if not html:
+            return ""
+        if "<" not in html and "&" not in html and "\x00" not in html and "\ufeff" not in html:
+            return html.replace("\r\n", "\n").replace("\r", "\n").strip()
+        return _html_to_text(html)
 
     def clean_text(self, text: str | None) -> str:
         """
@@ -94,7 +202,7 @@ class BaseScraper(ABC):
             return ""
 
         # Normalize whitespace
-        text = re.sub(r"\s+", " ", text)
+        text = _WHITESPACE_RE.sub(" ", text)
 
         # Remove leading/trailing whitespace
         text = text.strip()
@@ -117,13 +225,8 @@ class BaseScraper(ABC):
             str: Extracted course code or original text
         """
         # Common course code patterns
-        patterns = [
-            r"([A-Z]{2,4}[- ]?\d{3}[A-Z]?)",  # CSCD 101, CS101, DCIT-103
-            r"([A-Z]{2,4}\s+\d{3})",  # CSCD 101
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _COURSE_CODE_RES:
+            match = pattern.search(text)
             if match:
                 return match.group(1).upper()
 
@@ -142,4 +245,4 @@ class BaseScraper(ABC):
         Returns:
             str: Full URL to the tool
         """
-        return f"{self.session.base_url}/portal/site/{site_id}/tool-reset/{tool}"
+        return self.session.base_url + self.TOOL_PATH.format(site_id=site_id, tool=tool)
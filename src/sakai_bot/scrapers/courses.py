@@ -26,10 +26,20 @@ class CourseScraper(BaseScraper):
     empty list when sites are enrolled; records why in `fallback_reason`.
     """
 
+    # Paged membership listing
+    SITES_PATH = "/direct/site.json?_limit={limit}&_start={start}"
+    PAGE_SIZE = 50
+
+    # Site types that are never courses
+    SKIP_SITE_TYPES = frozenset({"myworkspace"})
+
     def __init__(self, session: SakaiSession):
         """Initialize course scraper."""
         super().__init__(session)
         self.fallback_reason: str | None = None
+        # Normalized code -> first course with it, built by the last
+        # non-empty scrape() (None until then)
+        self._code_index: dict[str, Course] | None = None
 
     def scrape(self) -> list[Course]:
         """
@@ -44,16 +54,15 @@ class CourseScraper(BaseScraper):
         courses: list[Course] = []
         try:
             all_sites: list = []
-            limit = 50
             while True:
                 data = self.session.get_json(
-                    f"/direct/site.json?_limit={limit}&_start={len(all_sites)}"
+                    self.SITES_PATH.format(limit=self.PAGE_SIZE, start=len(all_sites))
                 )
                 sites = data.get("site_collection", [])
                 if not sites:
                     break
                 all_sites.extend(sites)
-                if len(sites) < limit:
+                if len(sites) < self.PAGE_SIZE:
                     break
 
             for site in all_sites:
@@ -93,6 +102,9 @@ class CourseScraper(BaseScraper):
             logger.warning(f"Filter would leave 0 courses; falling back ({self.fallback_reason})")
 
         logger.info(f"Found {len(final)} enrolled courses")
+        self._code_index = {}
+        for course in final:
+            self._code_index.setdefault(self._normalize_code(course.code), course)
         return final
 
     def _select_target_term(self, courses: list[Course]) -> str | None:
@@ -140,18 +152,15 @@ class CourseScraper(BaseScraper):
         Returns:
             Course or None if not a valid course site
         """
-        site_id = site.get("id", "")
-        title = site.get("title", "")
+        site_id = site.get("id")
+        title = site.get("title")
 
-        # Skip special sites (user workspace, admin, etc.)
-        if not site_id or site_id.startswith(("~", "!")):
-            return None
-        if not title:
+        # Skip special sites (user workspace, admin, etc.) and untitled ones
+        if not site_id or site_id[0] in "~!" or not title:
             return None
 
         # Skip the "My Workspace" type sites
-        site_type = site.get("type", "")
-        if site_type in ("myworkspace",):
+        if site.get("type") in self.SKIP_SITE_TYPES:
             return None
 
         url = f"{self.session.base_url}/portal/site/{site_id}"
@@ -179,22 +188,35 @@ class CourseScraper(BaseScraper):
             return match.group(1) >= min_digit
         return True  # Include if we can't determine level
 
+    @staticmethod
+    def _normalize_code(code: str) -> str:
+        """Course code in lookup form: upper case, no spaces ("dcit 306" -> "DCIT306")."""
+        return code.upper().replace(" ", "")
+
     def get_course_by_code(self, code: str) -> Course | None:
         """
         Find a specific course by code.
 
+        Uses the index from the last scrape() (scraping first if there is
+        none). An exact (normalized) match is a dict lookup; otherwise the
+        first course whose code contains, or is contained in, the given one.
+
         Args:
             code: Course code to find
 
         Returns:
             Course or None if not found
         """
-        courses = self.scrape()
-        code_upper = code.upper().replace(" ", "")
-
-        for course in courses:
-            course_code_clean = course.code.upper().replace(" ", "")
-            if code_upper in course_code_clean or course_code_clean in code_upper:
+        if self._code_index is None:
+            self.scrape()
+        index = self._code_index or {}
+        key = self._normalize_code(code)
+
+        course = index.get(key)
+        if course:
+            return course
+        for course_code, course in index.items():
+            if key in course_code or course_code in key:
                 return course
 
         return None
@@ -17,6 +17,11 @@ from sakai_bot.scrapers.base import BaseScraper
 logger = logging.getLogger(__name__)
 
 
+def _shortest_keywords(keywords: tuple[str, ...]) -> tuple[str, ...]:
+    """Drop keywords that contain another keyword (matching them adds nothing)."""
+    return tuple(k for k in keywords if not any(o != k and o in k for o in keywords))
+
+
 class ExamDetector(BaseScraper):
     """
     Detects exams and quizzes from Sakai content.
@@ -25,7 +30,7 @@ class ExamDetector(BaseScraper):
     Tests & Quizzes tool via REST API.
     """
 
-    EXAM_KEYWORDS = [
+    EXAM_KEYWORDS = (
         "exam",
         "examination",
         "midterm",
@@ -48,21 +53,39 @@ class ExamDetector(BaseScraper):
         "continuous assessment",
         "ca test",
         "ca exam",
-    ]
+    )
+
+    # The keywords a substring check actually needs ("examination", "lab exam",
+    # ... already match on "exam"), so each text is scanned fewer times
+    MATCH_KEYWORDS = _shortest_keywords(EXAM_KEYWORDS)
 
-    DATE_PATTERNS = [
+    # Compiled once at class load; each is searched against every
+    # exam-related announcement
+    DATE_PATTERNS = (
         # January 15, 2024
-        r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
-        r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)"
-        r"\s+\d{1,2}(?:st|nd|rd|th)?,?\s*\d{4}",
+        re.compile(
+            r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
+            r"Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)"
+            r"\s+\d{1,2}(?:st|nd|rd|th)?,?\s*\d{4}",
+            re.IGNORECASE,
+        ),
         # 15/01/2024
-        r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}",
-    ]
+        re.compile(r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}"),
+    )
 
-    TIME_PATTERNS = [
-        r"\d{1,2}:\d{2}\s*(?:am|pm|AM|PM)?",
-        r"\d{1,2}\s*(?:am|pm|AM|PM)",
-    ]
+    TIME_PATTERNS = (
+        re.compile(r"\d{1,2}:\d{2}\s*(?:am|pm|AM|PM)?"),
+        re.compile(r"\d{1,2}\s*(?:am|pm|AM|PM)"),
+    )
+
+    LOCATION_PATTERN = re.compile(
+        r"(?:venue|location|room|hall|lab)[\s:]+([^\n,.]+)", re.IGNORECASE
+    )
+
+    # Shortest text each kind of pattern can match ("1/1/26", "lab 1");
+    # anything shorter is skipped without running the regexes
+    MIN_DATE_LENGTH = 6
+    MIN_LOCATION_LENGTH = 5
 
     def __init__(self, session: SakaiSession):
         """Initialize exam detector."""
@@ -83,25 +106,20 @@ class ExamDetector(BaseScraper):
         Returns:
             List[Exam]: Detected exams
         """
-        all_exams: list[Exam] = []
+        # Deduplicate announcements by ID first, so each is analyzed once
+        # (exam IDs derive from the announcement ID, so exams come out unique)
+        unique_announcements: list[Announcement] = []
+        self._dedupe_extend(unique_announcements, set(), announcements or [])
 
         # Detect from announcements
-        if announcements:
-            for announcement in announcements:
-                exam = self._detect_from_announcement(announcement)
-                if exam:
-                    all_exams.append(exam)
-
-        # Deduplicate by ID
-        seen_ids: set = set()
-        unique_exams: list[Exam] = []
-        for exam in all_exams:
-            if exam.id not in seen_ids:
-                seen_ids.add(exam.id)
-                unique_exams.append(exam)
-
-        logger.info(f"Detected {len(unique_exams)} exams/quizzes")
-        return unique_exams
+        all_exams: list[Exam] = []
+        for announcement in unique_announcements:
+            exam = self._detect_from_announcement(announcement)
+            if exam:
+                all_exams.append(exam)
+
+        logger.info(f"Detected {len(all_exams)} exams/quizzes")
+        return all_exams
 
     def _detect_from_announcement(self, announcement: Announcement) -> Exam | None:
         """
@@ -142,10 +160,7 @@ class ExamDetector(BaseScraper):
 
     def _contains_exam_keywords(self, text: str) -> bool:
         """Check if text contains exam-related keywords."""
-        for keyword in self.EXAM_KEYWORDS:
-            if keyword in text:
-                return True
-        return False
+        return any(keyword in text for keyword in self.MATCH_KEYWORDS)
 
     def _determine_exam_type(self, text: str) -> str:
         """Determine the type of exam from text."""
@@ -165,10 +180,10 @@ class ExamDetector(BaseScraper):
 
     def _extract_exam_date(self, text: str) -> datetime | None:
         """Extract date from text using patterns."""
-        if not text:
+        if not text or len(text) < self.MIN_DATE_LENGTH:
             return None
         for pattern in self.DATE_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 return self.parse_date(match.group(0))
         return None
@@ -178,20 +193,14 @@ class ExamDetector(BaseScraper):
         if not text:
             return None
         for pattern in self.TIME_PATTERNS:
-            match = re.search(pattern, text)
+            match = pattern.search(text)
             if match:
                 return match.group(0).strip()
         return None
 
     def _extract_location(self, text: str) -> str | None:
         """Extract location/venue from text."""
-        if not text:
+        if not text or len(text) < self.MIN_LOCATION_LENGTH:
             return None
-        patterns = [
-            r"(?:venue|location|room|hall|lab)[\s:]+([^\n,.]+)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return None
+        match = self.LOCATION_PATTERN.search(text)
+        return match.group(1).strip() if match else None
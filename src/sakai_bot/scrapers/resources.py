@@ -24,6 +24,9 @@ class ResourceScraper(BaseScraper):
     the whole semester's uploads. Folders and undated entries are skipped.
     """
 
+    # REST path, formatted per course
+    SITE_PATH = "/direct/content/site/{site_id}.json"
+
     def __init__(self, session: SakaiSession):
         """Initialize resource scraper."""
         super().__init__(session)
@@ -43,17 +46,12 @@ class ResourceScraper(BaseScraper):
         all_resources: list[Resource] = []
         seen_ids: set = set()
 
-        for course in courses:
-            try:
-                resources = self._scrape_course_resources(course, cutoff)
-                for res in resources:
-                    if res.id not in seen_ids:
-                        seen_ids.add(res.id)
-                        all_resources.append(res)
-                logger.debug(f"Found {len(resources)} recent resources in {course.code}")
-            except Exception as e:
-                logger.error(f"Error scraping resources for {course.code}: {e}")
-                continue
+        per_course = self.map_courses(
+            lambda course: self._scrape_course_resources(course, cutoff), courses, "resources"
+        )
+        for course, resources in zip(courses, per_course, strict=True):
+            self._dedupe_extend(all_resources, seen_ids, resources)
+            logger.debug(f"Found {len(resources)} recent resources in {course.code}")
 
         logger.info(f"Total recent resources scraped: {len(all_resources)}")
         return all_resources
@@ -70,7 +68,7 @@ class ResourceScraper(BaseScraper):
             List[Resource]: Recent files from this course
         """
         try:
-            data = self.session.get_json(f"/direct/content/site/{course.site_id}.json")
+            data = self.session.get_json(self.SITE_PATH.format(site_id=course.site_id))
         except Exception as e:
             logger.debug(f"Could not get resources for {course.code}: {e}")
             return []
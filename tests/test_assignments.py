@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from sakai_bot.models import AssignmentStatus, Course
+from sakai_bot.scrapers.assignments import AssignmentScraper
+
+NOW = datetime(2026, 3, 5, 12, 0, tzinfo=timezone.utc)
+
+COURSE = Course(
+    site_id="site-1",
+    code="DCIT 301",
+    title="Operating Systems",
+    url="https://sakai.example.com/portal/site/site-1",
+)
+
+
+def make_scraper(payload):
+    session = Mock()
+    session.get_json.return_value = payload
+    session.base_url = "https://sakai.example.com"
+    return AssignmentScraper(session)
+
+
+@pytest.mark.parametrize(
+    "status, due, expected",
+    [
+        ("Submitted", None, AssignmentStatus.SUBMITTED),
+        ("Graded", None, AssignmentStatus.GRADED),
+        ("Returned", None, AssignmentStatus.GRADED),
+        ("", NOW - timedelta(hours=1), AssignmentStatus.LATE),
+        (None, NOW + timedelta(hours=1), AssignmentStatus.NOT_STARTED),
+    ],
+)
+def test_determine_status(status, due, expected):
+    scraper = make_scraper({})
+    assert scraper._determine_status({"status": status}, due, None, NOW) is expected
+
+
+def test_closed_wins_over_late():
+    scraper = make_scraper({})
+    past = NOW - timedelta(days=1)
+    assert scraper._determine_status({}, past, past, NOW) is AssignmentStatus.CLOSED
+
+
+def test_scrape_keeps_only_monitored_courses():
+    due = int((datetime.now(timezone.utc) + timedelta(days=2)).timestamp() * 1000)
+    scraper = make_scraper(
+        {
+            "assignment_collection": [
+                {"id": "a1", "title": "Lab 1", "context": "site-1", "dueTime": due},
+                {"id": "a1", "title": "Lab 1", "context": "site-1", "dueTime": due},
+                {"id": "x1", "title": "Other", "context": "site-9", "dueTime": due},
+            ]
+        }
+    )
+    (assignment,) = scraper.scrape([COURSE])
+    assert assignment.course_code == "DCIT 301"
+    assert assignment.status is AssignmentStatus.NOT_STARTED
@@ -0,0 +1,114 @@
+import re
+from unittest.mock import Mock
+
+import pytest
+
+from sakai_bot.models import Course
+from sakai_bot.scrapers.announcements import AnnouncementScraper
+from sakai_bot.scrapers.base import _html_to_text, _parse_date_text
+from sakai_bot.scrapers.resources import ResourceScraper
+
+
+@pytest.fixture
+def scraper():
+    return ResourceScraper(Mock())
+
+
+@pytest.mark.parametrize(
+    "html, expected",
+    [
+        ("", ""),
+        ("   ", ""),
+        ("plain text", "plain text"),
+        ("<p>Hello <b>world</b></p><p>Fish &amp; chips</p>", "Hello\nworld\nFish & chips"),
+        ("Line1<br>Line2", "Line1\nLine2"),
+        ("<p>a<!-- note -->b</p>", "a\nb"),
+        ("<div>x<script>var s;</script><style>p{}</style>tail</div>", "x\ntail"),
+        ("<html><head><title>T</title></head><body><p>x</p></body></html>", "T\nx"),
+    ],
+)
+def test_clean_html_extracts_visible_text(scraper, html, expected):
+    assert scraper._clean_html(html) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["plain text", "  Lab moved\r\nto Friday\r ", "a > b\n\n\tc", "\u2028x\xa0"],
+)
+def test_clean_html_plain_text_matches_parser(scraper, text):
+    assert scraper._clean_html(text) == _html_to_text(text)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Due: Mar 5, 2026 11:59 PM", (2026, 3, 5, 23, 59)),
+        ("  Posted:\n  Jan 12,   2026 ", (2026, 1, 12, 0, 0)),
+        ("Opens: 2026-02-01 08:00", (2026, 2, 1, 8, 0)),
+    ],
+)
+def test_parse_date_strips_prefixes_and_whitespace(scraper, text, expected):
+    parsed = scraper.parse_date(text)
+    assert (parsed.year, parsed.month, parsed.day, parsed.hour, parsed.minute) == expected
+    assert parsed.tzinfo is not None
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("dcit-103 Intro", "DCIT-103"),
+        ("CSCD 101 - Programming", "CSCD 101"),
+        ("Physics Lab - Group A", "Physics Lab"),
+    ],
+)
+def test_extract_course_code(scraper, text, expected):
+    assert scraper.extract_course_code(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "2026-03-05T10:00:00.123Z",
+        "2026-03-05T10:00:00+00:00",
+        "2026-03-05 10:00",
+        "2026-03-05T10:00:00Z (GMT)",
+    ],
+)
+def test_parse_date_iso_fast_path_matches_dateutil(scraper, text, monkeypatch):
+    expected = scraper.parse_date(text)
+    monkeypatch.setattr("sakai_bot.scrapers.base._ISO_DATE_RE", re.compile(r"(?!)"))
+    _parse_date_text.cache_clear()
+    assert scraper.parse_date(text) == expected
+    assert str(scraper.parse_date(text)) == str(expected)
+
+
+def test_user_announcements_match_courses_by_site_id_then_title():
+    course = Course(site_id="s1", code="DCIT 306", title="DCIT 306 1 S2-2526", url="http://x")
+    feed = [
+        {"id": "a1", "title": "By id", "siteId": "s1"},
+        {"id": "a2", "title": "By title", "siteId": "s9", "siteTitle": "DCIT 306 1 S2-2526"},
+        {"id": "a3", "title": "Other", "siteId": "s8", "siteTitle": "MATH 101"},
+    ]
+    session = Mock(base_url="http://x")
+    session.get_json.side_effect = lambda path: (
+        {"announcement_collection": feed} if "user.json" in path else {}
+    )
+    announcements = AnnouncementScraper(session).scrape([course])
+    assert [a.id for a in announcements] == ["a1", "a2"]
+    assert {a.course_code for a in announcements} == {"DCIT 306"}
+
+
+def test_dedupe_extend_keeps_first_occurrence_in_order():
+    a1, b, a2 = Mock(id="a"), Mock(id="b"), Mock(id="a")
+    target, seen = [], {"c"}
+    ResourceScraper._dedupe_extend(target, seen, [a1, b, a2, Mock(id="c")])
+    assert target == [a1, b]
+    assert seen == {"a", "b", "c"}
+
+
+def test_parse_date_memoizes_and_applies_timezone(scraper):
+    _parse_date_text.cache_clear()
+    first = scraper.parse_date("Due: Mar 5, 2026 11:59 PM")
+    assert scraper.parse_date("Due: Mar 5, 2026 11:59 PM") == first
+    assert _parse_date_text.cache_info().hits == 1
+    assert first.tzinfo is scraper.timezone
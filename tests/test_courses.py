@@ -23,8 +23,9 @@ def _site(site_id, title, type_="course"):
 
 def _make_scraper(sites, *, current_semester=None, level_filter=None):
     scraper = CourseScraper(StubSession(sites))
-    scraper.settings.current_semester = current_semester
-    scraper.settings.course_level_filter = level_filter
+    scraper.settings = scraper.settings.model_copy(
+        update={"current_semester": current_semester, "course_level_filter": level_filter}
+    )
     return scraper
 
 
@@ -103,3 +104,23 @@ def test_no_sites_returns_empty_without_fallback():
     courses = scraper.scrape()
     assert courses == []
     assert scraper.fallback_reason is None
+
+
+def test_get_course_by_code_prefers_exact_match():
+    sites = [_site("s1", "DCIT 306L 1 S2-2526"), _site("s2", "DCIT 306 1 S2-2526")]
+    scraper = _make_scraper(sites)
+    assert scraper.get_course_by_code("dcit 306").site_id == "s2"
+    assert scraper.get_course_by_code("DCIT30").site_id == "s1"
+    assert scraper.get_course_by_code("MATH 101") is None
+
+
+def test_get_course_by_code_reuses_scraped_index():
+    session = StubSession([_site("s1", "DCIT 306 1 S2-2526")])
+    calls = []
+    fetch = session.get_json
+    session.get_json = lambda path: calls.append(path) or fetch(path)
+    scraper = CourseScraper(session)
+
+    assert scraper.get_course_by_code("DCIT306").site_id == "s1"
+    assert scraper.get_course_by_code("dcit 306").site_id == "s1"
+    assert len(calls) == 1
@@ -36,7 +36,7 @@ def service():
     store = Mock()
     store.has_been_sent.return_value = False
     notifier = Mock()
-    notifier.send_message.return_value = True
+    notifier.send_batch.side_effect = lambda messages: [True] * len(messages)
     formatter = Mock()
     formatter.format_digest.return_value = "digest"
     return DigestService(store, notifier, formatter)
@@ -44,7 +44,7 @@ def service():
 
 def test_sends_on_sunday_evening(service):
     assert service.maybe_send([make_assignment(2)], [], now=SUNDAY_EVENING) is True
-    service.notifier.send_message.assert_called_once()
+    service.notifier.send_batch.assert_called_once()
     key = service.store.mark_as_sent.call_args[0][0].dedup_key
     assert key == "digest:2026-07-19"
 
@@ -55,13 +55,13 @@ def test_skips_outside_window(service):
 
     sunday_morning = SUNDAY_EVENING.replace(hour=9)
     assert service.maybe_send([make_assignment(2)], [], now=sunday_morning) is False
-    service.notifier.send_message.assert_not_called()
+    service.notifier.send_batch.assert_not_called()
 
 
 def test_sends_only_once_per_week(service):
     service.store.has_been_sent.return_value = True
     assert service.maybe_send([make_assignment(2)], [], now=SUNDAY_EVENING) is False
-    service.notifier.send_message.assert_not_called()
+    service.notifier.send_batch.assert_not_called()
 
 
 def test_filters_to_next_seven_days(service):
@@ -95,6 +95,6 @@ def test_disabled_via_settings(service, monkeypatch):
 
 
 def test_failed_send_does_not_mark_as_sent(service):
-    service.notifier.send_message.return_value = False
+    service.notifier.send_batch.side_effect = lambda messages: [False] * len(messages)
     assert service.maybe_send([], [], now=SUNDAY_EVENING) is False
     service.store.mark_as_sent.assert_not_called()
@@ -0,0 +1,71 @@
+from unittest.mock import Mock
+
+from sakai_bot.models import Announcement
+from sakai_bot.scrapers.exams import ExamDetector
+
+
+def announcement(title: str, content: str) -> Announcement:
+    return Announcement(
+        id="a1",
+        course_code="DCIT 301",
+        course_title="Operating Systems",
+        title=title,
+        content=content,
+    )
+
+
+def test_detects_exam_details_from_announcement():
+    detector = ExamDetector(Mock())
+    (exam,) = detector.scrape(
+        [],
+        [
+            announcement(
+                "Midterm Exam",
+                "The midterm is on MARCH 12th, 2026 at 9:30 am. Venue: JQB 19, ground floor.",
+            ),
+            announcement("Lecture notes", "Slides for week 4 are up."),
+        ],
+    )
+    assert exam.exam_type == "midterm"
+    assert (exam.exam_date.year, exam.exam_date.month, exam.exam_date.day) == (2026, 3, 12)
+    assert exam.exam_time == "9:30 am"
+    assert exam.location == "JQB 19"
+
+
+def test_missing_details_are_none():
+    detector = ExamDetector(Mock())
+    assert detector._extract_exam_date("no date here") is None
+    assert detector._extract_exam_time("") is None
+    assert detector._extract_location("see you in class") is None
+
+
+def test_match_keywords_cover_every_exam_keyword():
+    detector = ExamDetector(Mock())
+    assert len(detector.MATCH_KEYWORDS) < len(detector.EXAM_KEYWORDS)
+    for keyword in detector.EXAM_KEYWORDS:
+        assert detector._contains_exam_keywords(f"notice: {keyword} next week")
+    assert not detector._contains_exam_keywords("slides for week 4 are up")
+
+
+def test_duplicate_announcements_are_analyzed_once(monkeypatch):
+    detector = ExamDetector(Mock())
+    seen = []
+    detect = detector._detect_from_announcement
+
+    def counting_detect(ann):
+        seen.append(ann)
+        return detect(ann)
+
+    monkeypatch.setattr(detector, "_detect_from_announcement", counting_detect)
+    ann = announcement("Quiz 2", "Quiz on Friday")
+    exams = detector.scrape([], [ann, ann.model_copy()])
+    assert [e.id for e in exams] == ["ann-a1"]
+    assert seen == [ann]
+
+
+def test_shortest_matching_texts_pass_the_length_gates():
+    detector = ExamDetector(Mock())
+    assert len("1/1/26") == detector.MIN_DATE_LENGTH
+    assert detector._extract_exam_date("1/1/26") is not None
+    assert len("lab 1") == detector.MIN_LOCATION_LENGTH
+    assert detector._extract_location("lab 1") == "1"
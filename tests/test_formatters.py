@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from sakai_bot.models import Announcement, Assignment, Exam
+from sakai_bot.notify.formatters import MessageFormatter
+
+
+def make_assignment(due_in: timedelta) -> Assignment:
+    return Assignment(
+        id="a1",
+        course_code="DCIT 301",
+        course_title="Operating Systems",
+        title="Lab Report 3",
+        due_date=datetime.now(timezone.utc) + due_in,
+    )
+
+
+@pytest.mark.parametrize(
+    "due_in, urgency",
+    [
+        (timedelta(days=-3), "⚠️ OVERDUE"),
+        (timedelta(hours=5), "🔴 DUE TODAY"),
+        (timedelta(days=1, hours=5), "🟠 DUE SOON"),
+        (timedelta(days=2, hours=5), "🟠 DUE SOON"),
+        (timedelta(days=7, hours=5), "🟡"),
+        (timedelta(days=8, hours=5), "🟢"),
+    ],
+)
+def test_assignment_urgency(due_in, urgency):
+    due_line = next(
+        line
+        for line in MessageFormatter.format_assignment(make_assignment(due_in)).splitlines()
+        if line.startswith("📅")
+    )
+    assert due_line.endswith(f" {urgency}")
+
+
+def test_exam_type_is_normalized_for_emoji_lookup():
+    exam = Exam(id="e1", course_code="DCIT 305", course_title="t", title="t", exam_type="Midterm")
+    assert exam.exam_type == "midterm"
+    assert MessageFormatter.format_exam(exam).startswith("🚨 *MIDTERM ALERT* 📊")
+
+
+def test_announcement_message_layout():
+    announcement = Announcement(
+        id="1",
+        course_code="DCIT 301",
+        course_title="Operating Systems",
+        title="Lab moved",
+        content="  Lab is now on Friday.  ",
+        author="Dr. Mensah",
+        posted_at=datetime(2026, 7, 15, 9, 30),
+        url="https://sakai.example.com/a/1",
+    )
+    assert MessageFormatter.format_announcement(announcement) == (
+        "📢 *NEW ANNOUNCEMENT*\n\n"
+        "📚 *Course:* DCIT 301\n"
+        "📝 *Title:* Lab moved\n"
+        "👤 *Posted by:* Dr. Mensah\n"
+        "🕐 *Date:* Wed, Jul 15, 2026 at 09:30 AM\n\n"
+        f"{'─' * 20}\n\n"
+        "Lab is now on Friday.\n\n"
+        "🔗 View: https://sakai.example.com/a/1"
+    )
+
+
+def test_assignment_message_omits_empty_fields():
+    assignment = Assignment(
+        id="a1", course_code="DCIT 301", course_title="t", title="Lab 3", max_points=0.0
+    )
+    assert MessageFormatter.format_assignment(assignment) == (
+        "📋 *NEW ASSIGNMENT*\n\n📚 *Course:* DCIT 301\n📝 *Title:* Lab 3"
+    )
+
+
+def test_exam_message_layout():
+    exam = Exam(
+        id="e1",
+        course_code="DCIT 305",
+        course_title="Databases",
+        title="Quiz 2",
+        exam_type="quiz",
+        exam_time="9:00 AM",
+        location="JQB 19",
+        duration_minutes=90,
+        notes="Bring a calculator",
+    )
+    assert MessageFormatter.format_exam(exam) == (
+        "🚨 *QUIZ ALERT* ❓\n\n"
+        "📚 *Course:* DCIT 305\n"
+        "📝 *Title:* Quiz 2\n"
+        "🕐 *Time:* 9:00 AM\n"
+        "📍 *Location:* JQB 19\n"
+        "⏱️ *Duration:* 1h 30m\n\n"
+        f"{'─' * 20}\n\n"
+        "📌 Bring a calculator"
+    )
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("short text", "short text"),
+        ("one two three four", "one two..."),
+        ("abcdefghijklmnop", "abcdefghijk..."),
+    ],
+)
+def test_truncate_breaks_at_word_boundary(text, expected):
+    assert MessageFormatter._truncate(text, 14) == expected
+
+
+def test_countdowns_use_injected_now():
+    now = datetime(2026, 7, 15, 12, 0, tzinfo=timezone.utc)
+    exam = Exam(
+        id="e1",
+        course_code="DCIT 305",
+        course_title="t",
+        title="Final",
+        exam_date=now + timedelta(days=1, hours=2),
+    )
+    assert "🟠 TOMORROW!" in MessageFormatter.format_exam(exam, now=now)
+    assert "(Already passed)" in MessageFormatter.format_exam(exam, now=now + timedelta(days=3))
+
+    assignment = make_assignment(timedelta(days=30))
+    assert MessageFormatter.format_assignment(
+        assignment, now=assignment.due_date - timedelta(hours=3)
+    ).endswith("🔴 DUE TODAY")
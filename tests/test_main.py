@@ -1,6 +1,7 @@
+import threading
 from unittest.mock import Mock
 
-from sakai_bot.main import notify_fallback
+from sakai_bot.main import SakaiMonitor, notify_fallback
 
 
 def test_notify_fallback_sends_when_reason_present():
@@ -23,3 +24,74 @@ def test_notify_fallback_swallows_send_errors():
     telegram.send_message.side_effect = RuntimeError("network down")
     sent = notify_fallback(telegram, "some reason", 1)
     assert sent is False
+
+
+def _bare_monitor():
+    monitor = SakaiMonitor.__new__(SakaiMonitor)
+    monitor.telegram = Mock()
+    monitor.notification_store = Mock()
+    monitor.stats = {"notifications_sent": 0, "errors": 0}
+    monitor._stats_lock = threading.Lock()
+    return monitor
+
+
+def test_send_and_record_marks_only_delivered_items():
+    monitor = _bare_monitor()
+    first, second, third = Mock(title="a"), Mock(title="b"), Mock(title="c")
+    monitor.telegram.send_batch.return_value = [True, False, True]
+
+    sent = monitor._send_and_record([(first, "m1"), (second, "m2"), (third, "m3")])
+
+    assert sent == 2
+    monitor.telegram.send_batch.assert_called_once_with(["m1", "m2", "m3"])
+    monitor.notification_store.mark_many_as_sent.assert_called_once_with([first, third])
+    assert monitor.stats["notifications_sent"] == 2
+
+
+def test_send_and_record_counts_batch_errors():
+    monitor = _bare_monitor()
+    monitor.telegram.send_batch.side_effect = RuntimeError("boom")
+    assert monitor._send_and_record([(Mock(title="a"), "m1")]) == 0
+    monitor.notification_store.mark_many_as_sent.assert_not_called()
+    assert monitor.stats["errors"] == 1
+
+
+def test_notify_formats_and_sends_items_in_order():
+    monitor = _bare_monitor()
+    monitor.telegram.send_batch.return_value = [True, True]
+    first, second = Mock(title="a"), Mock(title="b")
+
+    assert monitor._notify([first, second], lambda item: f"msg:{item.title}") == 2
+    monitor.telegram.send_batch.assert_called_once_with(["msg:a", "msg:b"])
+
+
+def test_notify_skips_empty_and_swallows_format_errors():
+    monitor = _bare_monitor()
+    assert monitor._notify([], str) == 0
+
+    def broken(item):
+        raise ValueError("bad markdown")
+
+    assert monitor._notify([Mock(title="a")], broken) == 0
+    monitor.telegram.send_batch.assert_not_called()
+    assert monitor.stats["errors"] == 1
+
+
+def test_notify_defers_without_formatting_while_throttled():
+    monitor = _bare_monitor()
+    monitor.telegram.can_send.return_value = False
+
+    def unexpected(item):
+        raise AssertionError("formatted while throttled")
+
+    assert monitor._notify([Mock(title="a")], unexpected) == 0
+    monitor.telegram.send_batch.assert_not_called()
+
+
+def test_summary_goes_through_paced_batch():
+    monitor = _bare_monitor()
+    monitor.formatter = Mock()
+    monitor.formatter.format_summary.return_value = "summary"
+    monitor._send_summary([Mock(), Mock()], [], [])
+    monitor.telegram.send_batch.assert_called_once_with(["summary"])
+    monitor.telegram.send_message.assert_not_called()
@@ -1,4 +1,7 @@
-from sakai_bot.models import Course
+import pytest
+from pydantic import ValidationError
+
+from sakai_bot.models import Announcement, Course, short_hash
 
 
 def test_course_term_defaults_to_none():
@@ -9,3 +12,44 @@ def test_course_term_defaults_to_none():
 def test_course_accepts_term():
     course = Course(site_id="s1", code="DCIT 306", title="t", url="http://x", term="S2-2526")
     assert course.term == "S2-2526"
+
+
+def test_short_hash_matches_stored_sha256_prefix():
+    # Must stay stable: stored content_hash values were written with this digest.
+    assert short_hash("abc") == "ba7816bf8f01cfea"
+
+
+def test_announcement_content_hash_uses_short_hash():
+    ann = Announcement(
+        id="a1", course_code="DCIT 306", course_title="t", title="Quiz", content="Friday"
+    )
+    assert ann.content_hash == short_hash("Quiz|Friday")
+
+
+def test_content_hash_is_cached_and_refreshed_on_copy(monkeypatch):
+    ann = Announcement(
+        id="a1", course_code="DCIT 306", course_title="t", title="Quiz", content="Friday"
+    )
+    first = ann.content_hash
+    monkeypatch.setattr("sakai_bot.models.short_hash", lambda value: pytest.fail("recomputed"))
+    assert ann.content_hash == first
+    monkeypatch.undo()
+
+    moved = ann.model_copy(update={"content": "Monday"})
+    assert moved.content_hash == short_hash("Quiz|Monday")
+    assert moved.model_dump()["content_hash"] == moved.content_hash
+
+
+def test_scraped_items_are_frozen():
+    ann = Announcement(
+        id="a1", course_code="DCIT 306", course_title="t", title="Quiz", content="Friday"
+    )
+    with pytest.raises(ValidationError):
+        ann.title = "Exam"
+
+
+def test_course_is_frozen_and_hashable():
+    course = Course(site_id="s1", code="DCIT 306", title="t", url="http://x")
+    with pytest.raises(ValidationError):
+        course.code = "DCIT 101"
+    assert course in {course}
@@ -0,0 +1,192 @@
+from unittest.mock import Mock
+
+from sakai_bot.db import notification_store
+from sakai_bot.db.notification_store import NotificationStore
+from sakai_bot.models import NotificationType, SyntheticItem
+
+
+class FakeTable:
+    """Minimal stand-in for a supabase table query builder."""
+
+    def __init__(self, rows=None):
+        self.max_rows: int | None = None
+        self.orders: list[str] = []
+        self.rows = {row["dedup_key"]: row for row in rows or []}
+        self.lookups: list[list[str]] = []
+        self.pages: list[tuple[int, int]] = []
+        self.upserts: list[list[dict]] = []
+        self._keys: list[str] | None = None
+        self._codes: list[str] | None = None
+        self._type: str | None = None
+        self._range: tuple[int, int] | None = None
+        self._pending: list[dict] | None = None
+
+    def select(self, *args, **kwargs):
+        self._keys = self._codes = self._type = self._range = None
+        return self
+
+    def eq(self, column, value):
+        self._type = value
+        return self
+
+    def order(self, column):
+        self.orders.append(column)
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end)
+        self.pages.append(self._range)
+        return self
+
+    def limit(self, n):
+        return self
+
+    def in_(self, column, values):
+        if column == "course_code":
+            self._codes = list(values)
+            return self
+        self._keys = list(values)
+        self.lookups.append(self._keys)
+        return self
+
+    def upsert(self, records, on_conflict=None):
+        self._pending = records if isinstance(records, list) else [records]
+        return self
+
+    def execute(self):
+        if self._pending is not None:
+            self.upserts.append(self._pending)
+            for record in self._pending:
+                self.rows[record["dedup_key"]] = record
+            self._pending = None
+            return Mock(data=[])
+        keys = self._keys if self._keys is not None else list(self.rows)
+        rows = [self.rows[k] for k in keys if k in self.rows]
+        if self._type is not None:
+            rows = [r for r in rows if r.get("notification_type", "digest") == self._type]
+        if self._codes is not None:
+            rows = [r for r in rows if r.get("course_code") in self._codes]
+        if self._range is not None:
+            rows = rows[self._range[0] : self._range[1] + 1][: self.max_rows]
+        return Mock(data=rows)
+
+
+def make_store(rows=None) -> NotificationStore:
+    table = FakeTable(rows)
+    client = Mock()
+    client.table.return_value = table
+    return NotificationStore(client=client)
+
+
+def item(key: str, content_hash: str = "h1", course_code: str | None = None) -> SyntheticItem:
+    return SyntheticItem(
+        dedup_key=key,
+        content_hash=content_hash,
+        notification_type=NotificationType.DIGEST,
+        title=key,
+        course_code=course_code,
+    )
+
+
+def test_filter_unsent_uses_one_lookup_and_keeps_order():
+    store = make_store([{"dedup_key": "b", "content_hash": "h1"}])
+    items = [item("a"), item("b"), item("c")]
+    assert store.filter_unsent(items) == [items[0], items[2]]
+    assert store.table.lookups == [["a", "b", "c"]]
+
+
+def test_filter_unsent_returns_updated_content():
+    store = make_store([{"dedup_key": "a", "content_hash": "h0"}])
+    updated = item("a", "h2")
+    assert store.filter_unsent([updated]) == [updated]
+    assert store.has_been_sent(updated) is False
+
+
+def test_filter_unsent_chunks_large_key_sets(monkeypatch):
+    monkeypatch.setattr(notification_store, "LOOKUP_BATCH_SIZE", 2)
+    store = make_store()
+    store.filter_unsent([item(k) for k in "abcde"])
+    assert store.table.lookups == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_mark_many_as_sent_issues_single_upsert():
+    store = make_store()
+    items = [item("a"), item("b")]
+    assert store.mark_many_as_sent(items) is True
+    assert len(store.table.upserts) == 1
+    assert [r["dedup_key"] for r in store.table.upserts[0]] == ["a", "b"]
+    assert store.filter_unsent(items) == []
+
+
+def test_memory_fallback_when_table_missing():
+    store = make_store()
+    store._table_exists = False
+    a, b = item("a"), item("b")
+    store.mark_as_sent(a)
+    assert store.filter_unsent([a, b]) == [b]
+    assert store.table.upserts == []
+
+
+def test_mark_many_as_sent_refreshes_sent_at_on_update():
+    store = make_store([{"dedup_key": "a", "content_hash": "h0", "sent_at": "2020-01-01"}])
+    store.mark_many_as_sent([item("a", "h1")])
+    (record,) = store.table.upserts[0]
+    assert record["notification_type"] == "digest"
+    assert record["sent_at"] > "2020-01-01"
+
+
+def test_known_sent_items_skip_the_database():
+    store = make_store([{"dedup_key": "a", "content_hash": "h1"}])
+    a, b = item("a"), item("b")
+    assert store.filter_unsent([a]) == []
+    store.mark_as_sent(b)
+    store.table.lookups.clear()
+    assert store.filter_unsent([a, b]) == []
+    assert store.has_been_sent(a) is True
+    assert store.table.lookups == []
+
+
+def test_fetch_sent_keys_pages_and_skips_lookups(monkeypatch):
+    monkeypatch.setattr(notification_store, "FETCH_PAGE_SIZE", 2)
+    store = make_store([{"dedup_key": k, "content_hash": "h1"} for k in "abc"])
+    assert store.fetch_sent_keys(NotificationType.DIGEST) == {"a": "h1", "b": "h1", "c": "h1"}
+    assert store.table.pages == [(0, 1), (2, 3), (3, 4)]
+    assert set(store.table.orders) == {"id"}
+
+    new, updated = item("d"), item("c", "h2")
+    assert store.filter_unsent([item("a"), new, updated]) == [new, updated]
+    assert store.table.lookups == []
+
+
+def test_fetch_sent_keys_survives_server_page_cap(monkeypatch):
+    monkeypatch.setattr(notification_store, "FETCH_PAGE_SIZE", 3)
+    store = make_store([{"dedup_key": k, "content_hash": "h1"} for k in "abcde"])
+    store.table.max_rows = 2
+    assert set(store.fetch_sent_keys(NotificationType.DIGEST)) == set("abcde")
+    assert store.table.pages == [(0, 2), (2, 4), (4, 6), (5, 7)]
+
+
+def test_fetch_sent_keys_failure_falls_back_to_lookup():
+    store = make_store([{"dedup_key": "a", "content_hash": "h1"}])
+    store._table_exists = True
+    store.table.range = Mock(side_effect=RuntimeError("timeout"))
+    assert store.fetch_sent_keys(NotificationType.DIGEST) == {}
+    assert store.filter_unsent([item("a"), item("b")]) == [item("b")]
+    assert store.table.lookups == [["a", "b"]]
+
+
+def test_fetch_sent_keys_scoped_to_courses():
+    store = make_store(
+        [
+            {"dedup_key": "a", "content_hash": "h1", "course_code": "DCIT 306"},
+            {"dedup_key": "old", "content_hash": "h1", "course_code": "DCIT 101"},
+        ]
+    )
+    sent = store.fetch_sent_keys(NotificationType.DIGEST, course_codes={"DCIT 306"})
+    assert sent == {"a": "h1"}
+
+    current = item("b", course_code="DCIT 306")
+    other = item("old", course_code="DCIT 101")
+    # In-scope new item needs no lookup; out-of-scope item is still checked
+    assert store.filter_unsent([current, other]) == [current]
+    assert store.table.lookups == [["old"]]
@@ -33,9 +33,9 @@ def make_exam(in_hours: float | None):
 @pytest.fixture
 def service():
     store = Mock()
-    store.has_been_sent.return_value = False
+    store.filter_unsent.side_effect = lambda records: records
     notifier = Mock()
-    notifier.send_message.return_value = True
+    notifier.send_batch.side_effect = lambda messages: [True] * len(messages)
     formatter = Mock()
     formatter.format_reminder.return_value = "reminder"
     return ReminderService(store, notifier, formatter, hours=[24, 3])
@@ -43,27 +43,27 @@ def service():
 
 def test_no_reminder_outside_window(service):
     assert service.send_reminders([make_assignment(48)], [], now=NOW) == 0
-    service.notifier.send_message.assert_not_called()
+    service.notifier.send_batch.assert_not_called()
 
 
 def test_24h_reminder_fires_inside_window(service):
     assert service.send_reminders([make_assignment(20)], [], now=NOW) == 1
-    key = service.store.mark_as_sent.call_args[0][0].dedup_key
-    assert key == "reminder:assignment:a1:24h"
+    (record,) = service.store.mark_many_as_sent.call_args[0][0]
+    assert record.dedup_key == "reminder:assignment:a1:24h"
 
 
 def test_tightest_window_wins_and_suppresses_wider(service):
     # 2h before due: both 24h and 3h windows apply, one message only
     assert service.send_reminders([make_assignment(2)], [], now=NOW) == 1
-    service.notifier.send_message.assert_called_once()
-    keys = {call[0][0].dedup_key for call in service.store.mark_as_sent.call_args_list}
+    service.notifier.send_batch.assert_called_once()
+    keys = {record.dedup_key for record in service.store.mark_many_as_sent.call_args[0][0]}
     assert keys == {"reminder:assignment:a1:3h", "reminder:assignment:a1:24h"}
 
 
 def test_already_sent_window_does_not_refire(service):
-    service.store.has_been_sent.return_value = True
+    service.store.filter_unsent.side_effect = lambda records: []
     assert service.send_reminders([make_assignment(20)], [], now=NOW) == 0
-    service.notifier.send_message.assert_not_called()
+    service.notifier.send_batch.assert_not_called()
 
 
 def test_past_due_items_are_skipped(service):
@@ -81,27 +81,27 @@ def test_items_without_deadline_are_skipped(service):
 
 def test_exam_reminder_uses_exam_key(service):
     assert service.send_reminders([], [make_exam(2)], now=NOW) == 1
-    keys = {call[0][0].dedup_key for call in service.store.mark_as_sent.call_args_list}
+    keys = {record.dedup_key for record in service.store.mark_many_as_sent.call_args[0][0]}
     assert "reminder:exam:e1:3h" in keys
 
 
 def test_naive_due_date_is_treated_as_utc(service):
-    assignment = make_assignment(20)
-    assignment.due_date = assignment.due_date.replace(tzinfo=None)
+    aware = make_assignment(20)
+    assignment = aware.model_copy(update={"due_date": aware.due_date.replace(tzinfo=None)})
     assert service.send_reminders([assignment], [], now=NOW) == 1
 
 
 def test_failed_send_does_not_mark_as_sent(service):
-    service.notifier.send_message.return_value = False
+    service.notifier.send_batch.side_effect = lambda messages: [False] * len(messages)
     assert service.send_reminders([make_assignment(20)], [], now=NOW) == 0
-    service.store.mark_as_sent.assert_not_called()
+    service.store.mark_many_as_sent.assert_not_called()
 
 
 def test_rescheduled_deadline_changes_content_hash(service):
     service.send_reminders([make_assignment(20)], [], now=NOW)
-    first_hash = service.store.mark_as_sent.call_args[0][0].content_hash
-    service.store.mark_as_sent.reset_mock()
+    first_hash = service.store.mark_many_as_sent.call_args[0][0][0].content_hash
+    service.store.mark_many_as_sent.reset_mock()
 
     service.send_reminders([make_assignment(22)], [], now=NOW)
-    second_hash = service.store.mark_as_sent.call_args[0][0].content_hash
+    second_hash = service.store.mark_many_as_sent.call_args[0][0][0].content_hash
     assert first_hash != second_hash
@@ -118,6 +118,34 @@ def test_api_failure_is_non_fatal():
     assert scraper.scrape([COURSE]) == []
 
 
+def test_courses_are_fetched_independently_and_in_order():
+    courses = [
+        COURSE.model_copy(update={"site_id": f"site-{i}", "code": f"DCIT 30{i}"})
+        for i in range(1, 6)
+    ]
+
+    def get_json(path):
+        site_id = path.split("/")[-1].removesuffix(".json")
+        if site_id == "site-3":
+            raise RuntimeError("boom")
+        return {
+            "content_collection": [
+                {
+                    "resourceId": f"/group/{site_id}/notes.pdf",
+                    "title": "Notes",
+                    "modifiedDate": NOW_MS,
+                }
+            ]
+        }
+
+    scraper = make_scraper(None)
+    scraper.session.get_json.side_effect = get_json
+
+    resources = scraper.scrape(courses)
+
+    assert [r.course_code for r in resources] == ["DCIT 301", "DCIT 302", "DCIT 304", "DCIT 305"]
+
+
 def test_reupload_changes_content_hash():
     def payload(size):
         return {
@@ -0,0 +1,294 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import lxml.html
+import pytest
+import requests
+
+from sakai_bot.auth.sakai_session import SakaiAuthError, SakaiSession
+from sakai_bot.config import get_settings
+
+
+def test_extract_csrf_token_from_named_input():
+    doc = lxml.html.fromstring(
+        '<form><input name="eid"><input name="sakai_csrf_token" value="abc123"></form>'
+    )
+    assert SakaiSession()._extract_csrf_token(doc) == "abc123"
+
+
+def test_extract_csrf_token_skips_empty_and_falls_back_to_meta():
+    doc = lxml.html.fromstring(
+        '<html><head><meta name="csrf-token" content="meta-token"></head>'
+        '<body><input name="_csrf" value=""></body></html>'
+    )
+    assert SakaiSession()._extract_csrf_token(doc) == "meta-token"
+
+
+def test_extract_csrf_token_absent():
+    doc = lxml.html.fromstring("<form><input name='eid'></form>")
+    assert SakaiSession()._extract_csrf_token(doc) is None
+
+
+def test_extract_user_info_reads_current_user():
+    session = SakaiSession()
+    session._extract_user_info('<div class="Mrphs-user currentUser"> <b>10123456</b> </div>')
+    assert session.user_id == "10123456"
+
+
+def test_extract_user_info_ignores_missing_element():
+    session = SakaiSession()
+    session._extract_user_info("<p>nothing here</p>")
+    assert session.user_id is None
+
+
+class _Response:
+    def __init__(self, body: bytes, status_code: int = 200):
+        self.content = body
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+
+def _offline_session() -> SakaiSession:
+    session = SakaiSession()
+
+    def unreachable(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("offline")
+
+    session.session.get = unreachable
+    return session
+
+
+def test_verify_login_failure_indicator_wins():
+    body = b"<p>Invalid Login</p><a href='/portal/logout'>Logout</a>"
+    assert _offline_session()._verify_login(_Response(body)) is False
+
+
+def test_verify_login_success_indicator_extracts_user():
+    session = _offline_session()
+    body = b"<a>My Workspace</a><span id='loginUser'>10123456</span>"
+    assert session._verify_login(_Response(body)) is True
+    assert session.user_id == "10123456"
+
+
+def test_verify_login_without_indicators_fails():
+    assert _offline_session()._verify_login(_Response(b"<p>Welcome</p>")) is False
+
+
+def _session_api(status_code: int, body: bytes = b"{}") -> SakaiSession:
+    session = SakaiSession()
+    session.session.get = lambda *args, **kwargs: _Response(body, status_code)
+    return session
+
+
+def test_verify_login_trusts_session_api_user():
+    session = _session_api(200, b'{"userId": "abc-123", "userEid": "10123456"}')
+    assert session._verify_login(_Response(b"Invalid login")) is True
+    assert session.user_id == "10123456"
+
+
+def test_verify_login_anonymous_session_skips_html_fallback():
+    session = _session_api(200, b'{"userId": null}')
+    assert session._verify_login(_Response(b"<a>Logout</a>")) is False
+
+
+def test_verify_login_unauthorized_skips_html_fallback():
+    assert _session_api(403)._verify_login(_Response(b"<a>Logout</a>")) is False
+
+
+def test_verify_login_server_error_uses_html_fallback():
+    assert _session_api(503)._verify_login(_Response(b"<a>Logout</a>")) is True
+
+
+def _counting_session(monkeypatch, verify_results):
+    """SakaiSession whose form fetch and submit are stubbed and counted."""
+    calls = {"fetch": 0, "submit": []}
+    results = iter(verify_results)
+
+    def fetch(self):
+        calls["fetch"] += 1
+        self._login_form_cache = ("https://sakai/portal/xlogin", f"tok{calls['fetch']}", 0.0)
+        return self._login_form_cache[:2]
+
+    def submit(self, action, token):
+        calls["submit"].append(token)
+        return next(results)
+
+    monkeypatch.setattr(SakaiSession, "_fetch_login_form", fetch)
+    monkeypatch.setattr(SakaiSession, "_submit_login", submit)
+    return SakaiSession(), calls
+
+
+def test_relogin_reuses_cached_login_form(monkeypatch):
+    monkeypatch.setattr("sakai_bot.auth.sakai_session.time.time", lambda: 100.0)
+    session, calls = _counting_session(monkeypatch, [True, True])
+    session._attempt_login()
+    session._attempt_login()
+    assert calls["fetch"] == 1
+    assert calls["submit"] == ["tok1", "tok1"]
+
+
+def test_rejected_cached_form_is_refetched(monkeypatch):
+    monkeypatch.setattr("sakai_bot.auth.sakai_session.time.time", lambda: 100.0)
+    session, calls = _counting_session(monkeypatch, [True, False, True])
+    session._attempt_login()
+    session._attempt_login()
+    assert calls["fetch"] == 2
+    assert calls["submit"] == ["tok1", "tok1", "tok2"]
+
+
+def test_expired_login_form_is_refetched(monkeypatch):
+    session, calls = _counting_session(monkeypatch, [True, True])
+    session._attempt_login()
+    monkeypatch.setattr(
+        "sakai_bot.auth.sakai_session.time.time", lambda: SakaiSession.LOGIN_FORM_TTL + 1.0
+    )
+    session._attempt_login()
+    assert calls["fetch"] == 2
+
+
+def test_login_page_is_read_in_full():
+    session = SakaiSession()
+    page = b"<form action='/x'><input name='_csrf' value='t'></form>" + b"tail" * 100
+    calls = []
+
+    def get(*args, **kwargs):
+        calls.append(kwargs)
+        return _Response(page)
+
+    session.session.get = get
+    action, token = session._fetch_login_form()
+    assert token == "t"
+    assert action.endswith("/x")
+    assert "stream" not in calls[0]
+
+
+def _expiring_session(monkeypatch, login_result, threads=8):
+    """Session whose requests all see an expired session until a login succeeds."""
+    session = SakaiSession()
+    session._authenticated = True
+    state = {"expired": True, "logins": 0}
+    first_requests = threading.Semaphore(threads)
+    barrier = threading.Barrier(threads)
+
+    def get(url, **kwargs):
+        response = _Response(b"ok")
+        response.url = "https://sakai.ug.edu.gh/portal/xlogin" if state["expired"] else url
+        if first_requests.acquire(blocking=False):
+            barrier.wait(timeout=5)  # every thread sees the expiry first
+        return response
+
+    def login(self):
+        state["logins"] += 1
+        if login_result:
+            state["expired"] = False
+        return login_result
+
+    session.session.get = get
+    monkeypatch.setattr(SakaiSession, "login", login)
+    return session, state
+
+
+def _get_concurrently(session, paths):
+    def fetch(path):
+        try:
+            return session.get(path)
+        except SakaiAuthError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        return list(executor.map(fetch, paths))
+
+
+def test_concurrent_expired_requests_relogin_once(monkeypatch):
+    session, state = _expiring_session(monkeypatch, login_result=True)
+    paths = [f"/direct/site/{i}.json" for i in range(8)]
+    responses = _get_concurrently(session, paths)
+    assert state["logins"] == 1
+    assert [r.url for r in responses] == [session._get_url(p) for p in paths]
+
+
+def test_failed_relogin_is_not_retried_by_waiters(monkeypatch):
+    session, state = _expiring_session(monkeypatch, login_result=False)
+    results = _get_concurrently(session, [f"/direct/site/{i}.json" for i in range(8)])
+    assert state["logins"] == 1
+    assert all(isinstance(r, SakaiAuthError) for r in results)
+    assert session.is_authenticated is False
+
+
+def _error_response(status_code: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://sakai.ug.edu.gh/direct/site.json"
+    return response
+
+
+def test_get_check_raises_for_error_status():
+    session = SakaiSession()
+    session._authenticated = True
+    session.session.get = lambda *args, **kwargs: _error_response(500)
+    assert session.get("/direct/site.json").status_code == 500
+    with pytest.raises(requests.HTTPError):
+        session.get("/direct/site.json", check=True)
+
+
+def _cookie_session(monkeypatch, path) -> SakaiSession:
+    monkeypatch.setenv("SAKAI_COOKIE_FILE", str(path))
+    get_settings.cache_clear()
+    return SakaiSession()
+
+
+def test_cookies_persist_across_sessions(monkeypatch, tmp_path):
+    path = tmp_path / "cookies.txt"
+    first = _cookie_session(monkeypatch, path)
+    first.session.cookies.set("JSESSIONID", "abc.node1", domain="sakai.ug.edu.gh", path="/")
+    first._save_cookies()
+    assert path.stat().st_mode & 0o777 == 0o600
+
+    second = _cookie_session(monkeypatch, path)
+    assert second.session.cookies.get("JSESSIONID") == "abc.node1"
+
+
+def test_login_resumes_saved_session(monkeypatch, tmp_path):
+    path = tmp_path / "cookies.txt"
+    path.write_text("# Netscape HTTP Cookie File\n")
+    session = _cookie_session(monkeypatch, path)
+    session.session.cookies.set("JSESSIONID", "abc", domain="sakai.ug.edu.gh", path="/")
+    session._cookies_restored = True
+    session.session.get = lambda *args, **kwargs: _Response(b'{"userId": "u1"}')
+    monkeypatch.setattr(
+        SakaiSession, "_attempt_login", lambda self: pytest.fail("should not log in again")
+    )
+    assert session.login() is True
+    assert session.is_authenticated
+
+
+def test_context_exit_keeps_persisted_session(monkeypatch, tmp_path):
+    session = _cookie_session(monkeypatch, tmp_path / "cookies.txt")
+    session._authenticated = True
+    session.session.get = lambda *args, **kwargs: pytest.fail("should not log out")
+    session.__exit__(None, None, None)
+    assert (tmp_path / "cookies.txt").exists()
+
+
+def test_login_reports_unreachable_server_as_auth_error(monkeypatch):
+    def unreachable(self):
+        raise requests.exceptions.ConnectionError("down")
+
+    monkeypatch.setattr(SakaiSession, "_attempt_login", unreachable)
+    with pytest.raises(SakaiAuthError, match="unreachable"):
+        SakaiSession().login()
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/direct/site.json", "https://sakai.ug.edu.gh/direct/site.json"),
+        ("portal/site/x", "https://sakai.ug.edu.gh/portal/site/x"),
+        ("https://other.example/a", "https://other.example/a"),
+        ("//cdn.example/x.js", "https://cdn.example/x.js"),
+    ],
+)
+def test_get_url(path, expected):
+    assert SakaiSession()._get_url(path) == expected
@@ -0,0 +1,138 @@
+import json
+
+from sakai_bot.notify import telegram
+from sakai_bot.notify.telegram import TelegramNotifier
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_send_batch_paces_messages_and_keeps_order(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(telegram.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(telegram.time, "sleep", clock.sleep)
+    notifier = TelegramNotifier()
+    sent_at = []
+
+    def fake_send(message, parse_mode="Markdown"):
+        sent_at.append(clock.now)
+        return message != "bad"
+
+    monkeypatch.setattr(notifier, "send_message", fake_send)
+    assert notifier.send_batch(["a", "bad", "c"], rate_per_sec=2) == [True, False, True]
+    assert sent_at == [0.0, 0.5, 1.0]
+
+
+def test_send_batch_does_not_sleep_when_sends_are_slow(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(telegram.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(telegram.time, "sleep", clock.sleep)
+    notifier = TelegramNotifier()
+
+    def slow_send(message, parse_mode="Markdown"):
+        clock.now += 2.0
+        return True
+
+    monkeypatch.setattr(notifier, "send_message", slow_send)
+    notifier.send_batch(["a", "b", "c"], rate_per_sec=1)
+    assert clock.sleeps == []
+
+
+def test_send_batch_keeps_pacing_across_batches(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(telegram.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(telegram.time, "sleep", clock.sleep)
+    notifier = TelegramNotifier()
+    sent_at = []
+
+    def fake_send(message, parse_mode="Markdown"):
+        sent_at.append(clock.now)
+        return True
+
+    monkeypatch.setattr(notifier, "send_message", fake_send)
+    notifier.send_batch(["a", "b"], rate_per_sec=1)
+    notifier.send_batch(["c"], rate_per_sec=1)
+    assert sent_at == [0.0, 1.0, 2.0]
+
+
+class _Throttled:
+    status_code = 429
+    text = "Too Many Requests"
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+
+    @property
+    def content(self):
+        body = {"ok": False, "error_code": 429, "parameters": {"retry_after": self.retry_after}}
+        return json.dumps(body).encode()
+
+
+def test_long_rate_limit_defers_rest_of_batch(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(telegram.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(telegram.time, "sleep", clock.sleep)
+    notifier = TelegramNotifier()
+    posts = []
+
+    def post(*args, **kwargs):
+        posts.append(kwargs["json"]["text"])
+        return _Throttled(retry_after=120)
+
+    monkeypatch.setattr(notifier.session, "post", post)
+    assert notifier.send_batch(["a", "b", "c"]) == [False, False, False]
+    assert posts == ["a"]
+    assert notifier.can_send() is False
+
+
+def test_short_rate_limit_is_waited_out(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(telegram.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(telegram.time, "sleep", clock.sleep)
+    notifier = TelegramNotifier()
+    posts = []
+
+    def post(*args, **kwargs):
+        posts.append(clock.now)
+        return _Throttled(retry_after=5)
+
+    monkeypatch.setattr(notifier.session, "post", post)
+    notifier.send_batch(["a", "b"], rate_per_sec=1)
+    assert posts == [0.0, 5.0]
+
+
+def test_session_retries_connects_but_never_replays_sends():
+    retry = TelegramNotifier().session.get_adapter("https://api.telegram.org").max_retries
+    assert retry.connect == 3
+    assert not retry.is_retry("POST", 502)
+    assert retry.is_retry("GET", 502)
+    assert not retry.is_retry("GET", 429)
+
+
+def test_send_long_message_packs_paragraphs_and_paces_parts(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(telegram.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(telegram.time, "sleep", clock.sleep)
+    notifier = TelegramNotifier()
+    sent = []
+
+    def fake_send(message, parse_mode="Markdown"):
+        sent.append((clock.now, message))
+        return True
+
+    monkeypatch.setattr(notifier, "send_message", fake_send)
+    paragraph = "x" * 1500
+    assert notifier.send_long_message("\n\n".join([paragraph] * 4)) is True
+    assert [len(message) for _, message in sent] == [3002, 3018]
+    assert sent[1][1].startswith("(...continued)\n\n")
+    assert [at for at, _ in sent] == [0.0, 1.0]